@@ -4,19 +4,146 @@
 # Project: CH347PythonLib
 # Filename: device
 # Created on: 2023/7/31
+import os
+import threading
 import time
 
 import hid
 import struct
-from .__spi import CSConfig, SPIConfig
+from .__spi import CSConfig, SPIConfig, _RX_PAYLEN
+try:
+    from ._fast import spi_split_and_pack, parse_spi_frame, verify_acks
+except ImportError:
+    from .__spi import spi_split_and_pack, parse_spi_frame
+    from .__i2c import verify_acks
 from .__i2c import convert_i2c_address, convert_int_to_bytes
-from typing import Tuple, Any
+from typing import Tuple, Any, List
 from functools import wraps
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait
 import warnings
+import logging
 
 VENDOR_ID: int = 6790
 PRODUCT_ID: int = 21980
 
+logger = logging.getLogger(__name__)
+
+# pre-compiled frame headers
+_HDR_SPI_W = struct.Struct("<BHBH")  # report ID, length, SPI write cmd, payload length
+_HDR_SPI_R = struct.Struct("<BHBHL")  # report ID, length, SPI read cmd, 4, read length
+_HDR_LEN = struct.Struct("<H")  # frame length
+_HDR_CMD = struct.Struct("<BHB")  # report ID, length, command
+_HDR_UART = struct.Struct("<BH")  # report ID, UART payload length
+_UART_CONF = struct.Struct("<IBBBB")  # baudrate, stop bits, verify bits, data bits, timeout
+
+# I2C initialization commands of each clock frequency level (0-3)
+_INIT_I2C_CMDS = tuple(struct.pack("<BHBB", 0x00, 3, 0xaa, 0x60 | level) for level in range(4))
+
+# I2C stream tails keyed by (read length, whether a register address is written before reading),
+# the reading address byte of a restart (offset 2) is filled in per transaction
+_I2C_TAILS = {}
+for _read_len in range(64):
+    if _read_len == 0:
+        _tail = b"\x75"
+    elif _read_len == 1:
+        _tail = b"\xc0\x75"
+    else:
+        _tail = struct.pack("<bBB", -65 + _read_len, 0xc0, 0x75)
+    _I2C_TAILS[_read_len, False] = _tail
+    _I2C_TAILS[_read_len, True] = b"\x74\x81\x00" + _tail if _read_len else _tail
+del _read_len, _tail
+
+# idle timeout of a response read, hidapi returns as soon as a frame arrives so this only bounds the wait
+# for a device that stopped responding
+_RX_TIMEOUT_MS = 200
+
+# transmit buffer size covering the largest transfer, 32768 bytes of SPI payload split into frames of 507 bytes
+_TX_BUF_SIZE = 32768 + 6 * ((32768 + 506) // 507)
+
+# I2C requests kept in flight by a batch, well below the report queue of the HID driver
+_I2C_BATCH_WINDOW = 32
+
+# I2CStream commands packed into one frame by a write batch, a single write longer than this gets a frame of its own
+_I2C_STREAM_MAX = 64
+
+
+_ENUM_TTL = 1.0  # seconds that an HID enumeration result stays valid
+_ENUM_CACHE = {"ts": 0.0, "result": None}
+_PATH_CACHE = {}  # HID paths keyed by (vendor ID, product ID, interface number)
+
+
+def _cached_enumerate() -> list:
+    """
+    enumerate HID devices, reusing the result of last enumeration within _ENUM_TTL seconds
+    :return: list of HID device information
+    :rtype: list
+    """
+    now = time.monotonic()
+    if _ENUM_CACHE["result"] is None or now - _ENUM_CACHE["ts"] >= _ENUM_TTL:
+        _ENUM_CACHE["result"] = hid.enumerate()
+        _ENUM_CACHE["ts"] = now
+
+    return _ENUM_CACHE["result"]
+
+
+def invalidate_path_cache():
+    """
+    forget HID paths and enumeration results found so far, call it after the device is plugged again
+    :return:
+    """
+    _PATH_CACHE.clear()
+    _ENUM_CACHE["result"] = None
+
+
+def _find_device_path(vendor_id: int, product_id: int, interface_num: int) -> bytes:
+    """
+    find the HID path of given CH347 interface, stops at the first match and remembers the path found
+    :param vendor_id: the vendor ID of the device
+    :type vendor_id: int
+    :param product_id: the product ID of the device
+    :type product_id: int
+    :param interface_num: the interface number of the device
+    :type interface_num: int
+    :return: HID path of the interface
+    :rtype: bytes
+    """
+    key = (vendor_id, product_id, interface_num)
+    target = _PATH_CACHE.get(key)
+    if target is not None:
+        return target
+
+    target = next((ele['path'] for ele in _cached_enumerate()
+                   if ele['vendor_id'] == vendor_id and ele['product_id'] == product_id
+                   and ele['interface_number'] == interface_num), None)
+    if target is None:
+        raise IOError("CH347 device (VID: {:04x}, PID: {:04x}, interface: {}) not found".format(
+            vendor_id, product_id, interface_num))
+    _PATH_CACHE[key] = target
+
+    return target
+
+
+def _open_device_path(device: hid.device, vendor_id: int, product_id: int, interface_num: int):
+    """
+    open given CH347 interface, enumerating again if the remembered path is gone
+    :param device: HID device to open
+    :type device: hid.device
+    :param vendor_id: the vendor ID of the device
+    :type vendor_id: int
+    :param product_id: the product ID of the device
+    :type product_id: int
+    :param interface_num: the interface number of the device
+    :type interface_num: int
+    :return:
+    """
+    try:
+        device.open_path(_find_device_path(vendor_id, product_id, interface_num))
+    except IOError:
+        # the device may have been plugged again since its path was found
+        invalidate_path_cache()
+        device.open_path(_find_device_path(vendor_id, product_id, interface_num))
+
 
 class CH347HIDUART1(hid.device):
 
@@ -29,13 +156,7 @@ class CH347HIDUART1(hid.device):
         :type product_id: int
         """
         super(CH347HIDUART1, self).__init__()
-        target = None
-        for ele in hid.enumerate():
-            if ele["vendor_id"] == vendor_id and ele["product_id"] == product_id:
-                if ele['interface_number'] == 0:  # UART interface ID: 0
-                    target = ele['path']
-
-        self.open_path(target)
+        _open_device_path(self, vendor_id, product_id, 0)  # UART interface ID: 0
 
     def init_UART(self, baudrate: int = 115200, stop_bits: int = 1, verify_bits: int = 0, timeout: int = 32) -> bool:
         """
@@ -60,7 +181,7 @@ class CH347HIDUART1(hid.device):
         if timeout > 255:
             raise Exception("timeout should not exceed the maximum number of 255")
 
-        payload = header + struct.pack("<IBBBB", baudrate, stop_bits, verify_bits, 0x08, timeout)
+        payload = header + _UART_CONF.pack(baudrate, stop_bits, verify_bits, 0x08, timeout)
         response = bool(self.send_feature_report(payload))
 
         # response = self.get_feature_report(0, 16)
@@ -74,45 +195,99 @@ class CH347HIDUART1(hid.device):
         :return: wrote length
         :rtype: int
         """
+        length = len(data)
+        data_view = memoryview(data)
+        # one frame buffer (report ID, length, 510 bytes of payload max) reused for every frame
+        frame = bytearray(513)
+        frame_view = memoryview(frame)
+
         offset = 0
-        while len(data) - offset > 510:
-            payload = struct.pack("<BH", 0x00, 510) + data[offset:offset + 510]
-            self.write(payload)
+        _HDR_UART.pack_into(frame, 0, 0x00, 510)
+        while length - offset > 510:
+            frame_view[3:513] = data_view[offset:offset + 510]
+            self.write(frame)
             offset += 510
-        payload = struct.pack("<BH", 0x00, len(data) - offset) + data[offset:len(data)]
-        self.write(payload)
-        offset += len(data) - offset
+
+        left = length - offset
+        _HDR_UART.pack_into(frame, 0, 0x00, left)
+        frame_view[3:3 + left] = data_view[offset:length]
+        self.write(frame_view[:3 + left])
+        offset += left
 
         return offset
 
-    def read_raw(self, length: int = -1) -> list:
+    def read_raw(self, length: int = -1, timeout_ms: int = None) -> list:
         """
         Read data from the device if any byte is available
         :param length: maximum length of the data, default is -1 which means read all bytes that received
         :type length: int
+        :param timeout_ms: time to wait for each frame, default is 200 ms, when reading all bytes only the first frame
+        is waited for and the frames following it are only taken if queued already
+        :type timeout_ms: int
         :return: list of bytes read
         :rtype: list
         """
         self.set_nonblocking(1)
 
+        if timeout_ms is None:
+            timeout_ms = _RX_TIMEOUT_MS
+
         ret = []
         while len(ret) < length or length < 0:
-            chunk = self.read(512, timeout_ms=200)
+            chunk = self.read(512, timeout_ms=timeout_ms)
             if chunk:
-                chunk_len = struct.unpack("<H", bytes(chunk[0:2]))[0]
-                ret.extend(chunk[2:chunk_len+2])
+                # hidapi returns a list of ints, parse the length in place instead of converting it
+                chunk_len = chunk[0] | chunk[1] << 8
+                ret.extend(islice(chunk, 2, chunk_len + 2))
             else:
                 break
+            if length < 0:
+                # drain what follows without waiting
+                timeout_ms = 0
 
         self.set_nonblocking(0)
 
         return ret
 
 
+def _as_byte_view(data) -> memoryview:
+    """
+    view data to send as unsigned bytes, buffers of any item format are taken as their raw bytes and other sequences
+    (e.g. list of ints) or non-contiguous buffers are converted to bytes
+    :param data: data to send
+    :type data: :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`, :obj:`list`
+    :return: byte view of data, its length is the size of data in bytes
+    :rtype: memoryview
+    """
+    try:
+        return memoryview(data).cast("B")
+    except TypeError:
+        return memoryview(bytes(data))
+
+
+def _usb_power_control(hid_path: bytes) -> str:
+    """
+    find the runtime power management control of the USB device behind a hidraw node (Linux only)
+    :param hid_path: HID path of the interface, e.g. b'/dev/hidraw3'
+    :type hid_path: bytes
+    :return: sysfs path of the power control, None if the path is not a hidraw node
+    :rtype: str
+    """
+    path = os.fsdecode(hid_path)
+    if not path.startswith("/dev/hidraw"):
+        return None
+
+    # hidraw node -> HID device -> USB interface -> USB device
+    hid_dev = os.path.realpath(os.path.join("/sys/class/hidraw", os.path.basename(path), "device"))
+    usb_dev = os.path.dirname(os.path.dirname(hid_dev))
+
+    return os.path.join(usb_dev, "power", "control")
+
+
 class CH347HIDDev(hid.device):
 
     def __init__(self, vendor_id=VENDOR_ID, product_id=PRODUCT_ID, interface_num=None,
-                 enable_device_lock=True, warnings_enabled=True):
+                 enable_device_lock=True, warnings_enabled=True, tune_usb_latency=False):
         """
         Class of CH347 SPI/I2C/GPIO interface based on hidapi
         :param vendor_id: the vendor ID of the device
@@ -123,8 +298,10 @@ class CH347HIDDev(hid.device):
         :type interface_num: int
         :param enable_device_lock: whether to enable device in case of multithreading communication
         :type enable_device_lock: bool
-        :param warnings: whether to enable warnings output
-        :type warnings: bool
+        :param warnings_enabled: whether to enable warnings output
+        :type warnings_enabled: bool
+        :param tune_usb_latency: keep the device out of USB runtime suspend, see :meth:`_tune_usb_latency`
+        :type tune_usb_latency: bool
         """
 
         if interface_num is not None and warnings_enabled:
@@ -133,62 +310,245 @@ class CH347HIDDev(hid.device):
                           DeprecationWarning)
 
         super(CH347HIDDev, self).__init__()
-        target = None
-        for ele in hid.enumerate():
-            if ele["vendor_id"] == vendor_id and ele["product_id"] == product_id:
-                if ele['interface_number'] == 1:  # SPI/I2C/GPIO interface ID: 1
-                    target = ele['path']
+        self._open_interface(vendor_id, product_id)
+        if tune_usb_latency:
+            self._tune_usb_latency(vendor_id, product_id)
 
-        self.open_path(target)
-
-        self.CS1_enabled = False
-        self.CS2_enabled = False
+        self.__cs_state = 0  # 0: no CS enabled, 1: CS1 enabled, 2: CS2 enabled
         self.cs_activate_delay = 0
         self.cs_deactivate_delay = 0
         self.i2c_initiated = False
         self.spi_initiated = False
         self.lock_enabled = enable_device_lock
-        self.is_busy = False
-        self.warnings_enabled = warnings
+        self.__dev_lock = threading.RLock()  # reentrant, locked methods may call each other
+        self.warnings_enabled = bool(warnings_enabled)
+        self.partial_reads = 0  # count of SPI reads that ended before the expected length
+
+        # serialized CS configuration frames keyed by (CS pin, enable, whether the other CS is disabled),
+        # built with the delays of self.__cs_frames_delays
+        self.__cs_frames = {}
+        self.__cs_frames_delays = (0, 0)
+
+        self.__rx_executor = None
+        self.__rx_cancelled = False  # set to stop the receiver thread of an aborted transfer
+        self.__tx_buf = bytearray(_TX_BUF_SIZE)
+        self.__tx_mv = memoryview(self.__tx_buf)
+        self.__rx_buf = bytearray(512)
+        self.__rx_view = memoryview(self.__rx_buf)
+
+    def _open_interface(self, vendor_id: int, product_id: int):
+        """
+        open the SPI/I2C/GPIO interface of the device, transports other than HID override this
+        :param vendor_id: the vendor ID of the device
+        :type vendor_id: int
+        :param product_id: the product ID of the device
+        :type product_id: int
+        :return:
+        """
+        _open_device_path(self, vendor_id, product_id, 1)  # SPI/I2C/GPIO interface ID: 1
 
-    def __busy_check(self, timeout=5) -> bool:
+    def _tune_usb_latency(self, vendor_id: int, product_id: int) -> bool:
         """
-        Check if device is busy
-        :param timeout: time to wait for other thread to reset the busy flag
-        :type timeout: int
-        :return: busy status
+        keep the USB device out of runtime suspend so that the first transfer after an idle period does not wait for
+        the device to resume, applies to the Linux hidraw backend only and needs write access to sysfs
+        :param vendor_id: the vendor ID of the device
+        :type vendor_id: int
+        :param product_id: the product ID of the device
+        :type product_id: int
+        :return: whether the setting was applied
         :rtype: bool
         """
-        t0 = time.time()
-        while self.lock_enabled and self.is_busy and time.time() - t0 < timeout:
-            time.sleep(0.001)
+        try:
+            control = _usb_power_control(_find_device_path(vendor_id, product_id, 1))
+            if control is None:
+                return False
+            with open(control, "w") as f:
+                f.write("on")
+        except OSError as err:
+            logger.debug("USB runtime suspend not disabled: %s", err)
+            return False
+
+        logger.info("USB runtime suspend disabled through %s", control)
 
-        return self.is_busy
+        return True
 
-    def __device_lock(timeout: int = 5):
+    def __device_lock(timeout: int = 5, precondition=None):
         """
         device lock decorator
         :param timeout: timeout to wait for device to unlock
         :type timeout: int
+        :param precondition: Optional[Callable[[CH347HIDDev], None]], check raising an exception if the device is
+        not ready for the method, run before acquiring the lock
+        :type precondition: callable
         :return:
         """
 
         def aop(func):
             @wraps(func)
             def wrapper(self, *args, **kwargs):
-                # check busy flag
-                self.__busy_check(timeout)
-                # set busy flag
-                self.is_busy = True
-                ret = func(self, *args, **kwargs)
-                # unset busy flag
-                self.is_busy = False
-                return ret
+                if precondition is not None:
+                    precondition(self)
+                if not self.lock_enabled:
+                    return func(self, *args, **kwargs)
+                # wait for other thread to release the device
+                if not self.__dev_lock.acquire(timeout=timeout):
+                    raise TimeoutError("device is busy, failed to acquire device lock within {} s".format(timeout))
+                try:
+                    return func(self, *args, **kwargs)
+                finally:
+                    self.__dev_lock.release()
 
             return wrapper
 
         return aop
 
+    def __require_i2c(self):
+        """
+        check that I2C is initialized
+        :return:
+        """
+        if not self.i2c_initiated:
+            raise Exception('I2C device initialization required')
+
+    def __require_cs(self):
+        """
+        check that a CS is enabled for SPI transfers
+        :return:
+        """
+        if not self.__cs_state:
+            raise Exception("no CS enabled yet")
+
+    @property
+    def CS1_enabled(self) -> bool:
+        """
+        whether CS1 is enabled
+        :rtype: bool
+        """
+        return self.__cs_state == 1
+
+    @CS1_enabled.setter
+    def CS1_enabled(self, enable: bool):
+        if enable:
+            self.__cs_state = 1
+        elif self.__cs_state == 1:
+            self.__cs_state = 0
+
+    @property
+    def CS2_enabled(self) -> bool:
+        """
+        whether CS2 is enabled
+        :rtype: bool
+        """
+        return self.__cs_state == 2
+
+    @CS2_enabled.setter
+    def CS2_enabled(self, enable: bool):
+        if enable:
+            self.__cs_state = 2
+        elif self.__cs_state == 2:
+            self.__cs_state = 0
+
+    def __tx_view(self, size: int) -> memoryview:
+        """
+        get a view of the reusable transmit buffer with given size, the buffer is allocated for the largest transfer
+        and only grows if a frame exceeds it
+        :param size: size of the frame(s) to send
+        :type size: int
+        :return: writable view of the transmit buffer (valid until next transmission)
+        :rtype: memoryview
+        """
+        if size > len(self.__tx_buf):
+            self.__tx_buf = bytearray(size)
+            self.__tx_mv = memoryview(self.__tx_buf)
+
+        return self.__tx_mv[:size]
+
+    def __read_frame(self, timeout_ms: int = 0) -> memoryview:
+        """
+        read one frame from device into the reusable receive buffer
+        :param timeout_ms: timeout in milliseconds, 0 for blocking read
+        :type timeout_ms: int
+        :return: view of the frame received (valid until next read), empty if nothing received
+        :rtype: memoryview
+        """
+        frame = self.read(512, timeout_ms=timeout_ms)
+        length = len(frame)
+        self.__rx_buf[:length] = frame
+
+        return self.__rx_view[:length]
+
+    def __rx_worker(self) -> ThreadPoolExecutor:
+        """
+        get the single-threaded executor that receives frames in parallel with submission
+        :return: receiver executor
+        :rtype: ThreadPoolExecutor
+        """
+        if self.__rx_executor is None:
+            self.__rx_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ch347-rx")
+
+        return self.__rx_executor
+
+    def __spi_read_frames(self, ret: bytearray, strict: bool = False) -> int:
+        """
+        receive SPI frames into given buffer until it is filled or the device stops responding,
+        frames are taken as soon as they arrive, the read only blocks for the idle timeout once the device goes quiet
+        :param ret: buffer to fill with received payload
+        :type ret: :obj:`bytearray`, :obj:`memoryview`
+        :param strict: end the read as incomplete when a frame carries more payload than the space left, or when a
+        short frame (the last frame of a response) arrives before the buffer is filled, either means frames of this
+        read were lost and the data received belongs to the next read queued on the device
+        :type strict: bool
+        :return: length of data received
+        :rtype: int
+        """
+        length = len(ret)
+        offset = 0
+        while offset < length and not self.__rx_cancelled:
+            frame = self.__read_frame(timeout_ms=_RX_TIMEOUT_MS)
+            if not frame or strict and len(frame) >= 5 and _RX_PAYLEN.unpack_from(frame, 0)[0] > length - offset:
+                self.__warn_partial(offset, length)
+                break
+            payload_length = parse_spi_frame(frame, ret, offset)
+            offset += payload_length
+            if strict and payload_length < 507 and offset < length:
+                # responses are split into frames of 507 bytes, only the last one is shorter
+                self.__warn_partial(offset, length)
+                break
+
+        return offset
+
+    def __discard_frames(self):
+        """
+        read and drop frames until the device stays quiet for the idle timeout, so that responses of an aborted
+        transfer are not taken as the reply of the next one
+        :return:
+        """
+        while self.__read_frame(timeout_ms=_RX_TIMEOUT_MS):
+            pass
+
+    def __warn_partial(self, received: int, expected: int):
+        """
+        record an incomplete SPI read, logged only if warnings are enabled
+        :param received: length of data received
+        :type received: int
+        :param expected: length of data expected
+        :type expected: int
+        :return:
+        """
+        self.partial_reads += 1
+        if self.warnings_enabled:
+            logger.warning("read incomplete, read %d bytes (expecting %d bytes)", received, expected)
+
+    def close(self):
+        """
+        close device and stop the receiver thread if started
+        :return:
+        """
+        if self.__rx_executor is not None:
+            self.__rx_executor.shutdown(wait=False)
+            self.__rx_executor = None
+        super(CH347HIDDev, self).close()
+
     @__device_lock(2)
     def reset(self):
         """
@@ -196,7 +556,7 @@ class CH347HIDDev(hid.device):
         :return:
         """
         self.write(b"\x00\x04\x00\xca\x01\x00\x01\x00")  # reset device
-        self.read(512, timeout_ms=200)
+        self.read(512, timeout_ms=_RX_TIMEOUT_MS)  # device responds, the read returns as soon as it arrives
 
     # --*-- [ I2C ] --*--
     @__device_lock(2)
@@ -207,10 +567,13 @@ class CH347HIDDev(hid.device):
         :type clock_freq_level: int
         :return:
         """
-        self.write(struct.pack("<BHBB", 0x00, 3, 0xaa, 0x60 | clock_freq_level))
+        if not 0 <= clock_freq_level <= 3:
+            raise ValueError("I2C clock frequency level needs to be one of 0-3")
+
+        self.write(_INIT_I2C_CMDS[clock_freq_level])
         self.i2c_initiated = True
 
-    @__device_lock(2)
+    @__device_lock(2, __require_i2c)
     def i2c_write(self, addr: (int, bytes), data: (int, bytes)) -> bool:
         """
         write data through I2C bus using 7-bits address
@@ -230,13 +593,13 @@ class CH347HIDDev(hid.device):
         data = convert_int_to_bytes(data)
 
         # assemble i2c frame
-        payload = addr + data
+        payload = b"".join((addr, data))
         # send data through i2c stream
         status, feedback = self.__i2c_read_write_raw(payload)
 
         return status
 
-    @__device_lock(2)
+    @__device_lock(2, __require_i2c)
     def i2c_read(self, addr: (int, bytes), read_length: int,
                  register_addr: (int, bytes) = None) -> Tuple[bool, bytes]:
         """
@@ -252,25 +615,133 @@ class CH347HIDDev(hid.device):
         :return: Tuple[operation_status bool, feedback bytes]
         :rtype: (bool, bytes)
         """
-        # convert address
-        if register_addr is None:
-            register_addr = b""
-            # convert address with reading signal
-            addr = convert_i2c_address(addr, read=True)
-
-        else:
-            register_addr = convert_int_to_bytes(register_addr)
-            # convert address with writing signal
-            addr = convert_i2c_address(addr, read=False)
-
         # assemble payload
-        payload = addr + register_addr
+        payload = self.__i2c_read_payload(addr, register_addr)
 
         # send and receive data from i2c bus
         status, feedback = self.__i2c_read_write_raw(payload, read_len=read_length)
 
         return status, feedback
-    
+
+    @__device_lock(2, __require_i2c)
+    def i2c_read_into(self, buf, addr: (int, bytes), read_length: int = None,
+                      register_addr: (int, bytes) = None) -> Tuple[bool, int]:
+        """
+        read byte(s) data from i2c bus into a caller-owned buffer, see :meth:`i2c_read`
+        :param buf: writable buffer to receive data (e.g. bytearray, numpy array)
+        :type buf: :obj:`bytearray`, :obj:`memoryview`
+        :param addr: 7-bits of device address
+        :type addr: :obj:`int`, :obj:`bytes`
+        :param read_length: length of data to read from i2c bus, default is the size of buffer
+        :type read_length: int
+        :param register_addr: Optional[int, bytes], one byte or several bytes of address of register
+        :type register_addr: :obj:`int`, :obj:`bytes` (optional)
+        :return: Tuple[operation_status bool, length of data written into buffer int]
+        :rtype: (bool, int)
+        """
+        buf = memoryview(buf).cast("B")
+        if read_length is None:
+            read_length = len(buf)
+
+        payload = self.__i2c_read_payload(addr, register_addr)
+        status, feedback = self.__i2c_transfer(payload, read_len=read_length)
+        length = min(len(feedback), len(buf))
+        buf[:length] = feedback[:length]
+
+        return status, length
+
+    @__device_lock(2, __require_i2c)
+    def i2c_read_batch(self, requests: List[Tuple[Any, Any, int]]) -> List[Tuple[bool, bytes]]:
+        """
+        read several i2c registers back to back, all request frames are sent before any
+        response is collected so that the USB turnaround is paid once per window instead of once per read
+        :param requests: list of (addr, register_addr, read_length) in the same form as :meth:`i2c_read`,
+        register_addr may be None
+        :type requests: list
+        :return: list of (operation_status, feedback) in request order
+        :rtype: list
+        """
+        pending = []
+        for addr, register_addr, read_length in requests:
+            data = self.__i2c_read_payload(addr, register_addr)
+            pending.append((data, read_length, self.__i2c_build_frame(data, read_length, scratch=False)))
+
+        ret = []
+        for i in range(0, len(pending), _I2C_BATCH_WINDOW):
+            window = pending[i:i + _I2C_BATCH_WINDOW]
+            for _, _, raw in window:
+                self.write(raw)
+            for data, read_length, _ in window:
+                status, payload = self.__i2c_parse_frame(self.__read_frame(), data, read_length)
+                ret.append((status, bytes(payload)))
+
+        return ret
+
+    @__device_lock(2, __require_i2c)
+    def i2c_write_batch(self, requests: List[Tuple[Any, Any]]) -> List[bool]:
+        """
+        write several times through I2C bus, consecutive writes are packed into one I2CStream frame (each with its
+        own START and STOP) so that the USB turnaround is paid once per frame instead of once per write
+        :param requests: list of (addr, data) in the same form as :meth:`i2c_write`
+        :type requests: list
+        :return: list of operation status in request order
+        :rtype: list
+        """
+        frames = []
+        stream = bytearray()
+        sizes = []
+        for addr, data in requests:
+            payload = b"".join((convert_i2c_address(addr, read=False), convert_int_to_bytes(data)))
+            if len(payload) > 63:
+                raise Exception("data length exceeded max size of 62 Bytes")
+            if sizes and len(stream) + len(payload) + 3 > _I2C_STREAM_MAX:
+                frames.append((stream, sizes))
+                stream = bytearray()
+                sizes = []
+            # START, OUT with the length of payload, payload, STOP
+            stream += b"\x74"
+            stream.append(len(payload) | 0b1000_0000)
+            stream += payload
+            stream += b"\x75"
+            sizes.append(len(payload))
+        if sizes:
+            frames.append((stream, sizes))
+
+        ret = []
+        for i in range(0, len(frames), _I2C_BATCH_WINDOW):
+            window = frames[i:i + _I2C_BATCH_WINDOW]
+            for stream, _ in window:
+                raw = self.__i2c_stream_frame(len(stream), scratch=False)
+                raw[4:] = stream
+                self.write(raw)
+            for _, sizes in window:
+                feedback = self.__read_frame()
+                acks_end = _HDR_LEN.unpack_from(feedback, 0)[0] + 2
+                offset = 2
+                for size in sizes:
+                    # every byte written is acknowledged in order
+                    ret.append(offset + size <= acks_end and verify_acks(feedback, offset, offset + size))
+                    offset += size
+
+        return ret
+
+    def i2c_scan_range(self, start: int = 0, end: int = 128) -> List[int]:
+        """
+        probe every 7-bits address in range with an empty write, the probes (START, OUT, address, STOP, 4 bytes each)
+        are packed 16 to an I2CStream frame instead of one transaction per address
+        :param start: first address to probe, default is 0
+        :type start: int
+        :param end: address after the last to probe, default is 128
+        :type end: int
+        :return: list of addresses that acknowledged
+        :rtype: list
+        """
+        addresses = range(start, end)
+        statuses = self.i2c_write_batch([(addr, b"") for addr in addresses])
+
+        return [addr for addr, status in zip(addresses, statuses) if status]
+
+    @__device_lock(2, __require_i2c)
     def i2c_exists(self, addr: int | bytes) -> bool:
         """
         checks if device responds at given address (useful for I2C scanner)
@@ -295,38 +766,114 @@ class CH347HIDDev(hid.device):
         :return: tuple(<bool status>, <bytes feedback>)
         :rtype: (:obj:`bool`, :obj:`bytes`)
         """
-        if not self.i2c_initiated:
-            raise Exception('I2C device initialization required')
+        status, payload = self.__i2c_transfer(data, read_len)
 
-        if read_len == 0:
-            tail = b"\x75"
-        elif read_len == 1:
-            tail = b"\xc0\x75"
-            if len(data) > 1:
-                tail = b"\x74\x81\xd1" + tail
-        elif read_len < 64:
-            tail = struct.pack("<bBB", -65 + read_len, 0xc0, 0x75)
-            if len(data) > 1:
-                tail = b"\x74\x81\xd1" + tail
-        else:
-            raise Exception("read length exceeded max size of 63 Bytes")
-        payload = struct.pack("<BHBBB", 0x00, len(data) + len(tail) + 4, 0xaa, 0x74, len(data) | 0b1000_0000)
-        payload += data + tail
+        return status, bytes(payload)
+
+    def __i2c_transfer(self, data: bytes, read_len: int = 0) -> Tuple[bool, memoryview]:
+        """
+        read and write i2c bus through I2CStream, leaving the feedback in the receive buffer
+        :param read_len: length of data to read (max 63B)
+        :type read_len: int
+        :param data: data to write
+        :type data: bytes
+        :return: tuple(<bool status>, <memoryview feedback>), feedback is valid until next read
+        :rtype: (:obj:`bool`, :obj:`memoryview`)
+        """
+        self.write(self.__i2c_build_frame(data, read_len))
+
+        return self.__i2c_parse_frame(self.__read_frame(), data, read_len)
+
+    @staticmethod
+    def __i2c_read_payload(addr: (int, bytes), register_addr: (int, bytes) = None) -> bytes:
+        """
+        assemble the write part of an i2c read request
+        :param addr: 7-bits of device address
+        :type addr: :obj:`int`, :obj:`bytes`
+        :param register_addr: Optional[int, bytes], register address to write before reading
+        :type register_addr: :obj:`int`, :obj:`bytes` (optional)
+        :return: address byte followed by register address
+        :rtype: bytes
+        """
+        if register_addr is None:
+            # convert address with reading signal
+            return convert_i2c_address(addr, read=True)
 
-        self.write(payload)
+        # convert address with writing signal
+        return b"".join((convert_i2c_address(addr, read=False), convert_int_to_bytes(register_addr)))
 
-        feedback = bytes(self.read(512))
-        payload_length = struct.unpack("<H", feedback[:2])[0]
+    def __i2c_stream_frame(self, stream_length: int, scratch: bool = True) -> Any:
+        """
+        allocate an I2CStream HID frame for given length of stream commands with its header packed, the length counts
+        the END command that is left to the zero padding of the HID report
+        :param stream_length: length of stream commands following the I2CStream command byte
+        :type stream_length: int
+        :param scratch: build the frame in the reusable transmit buffer (valid until next transfer),
+        otherwise in a buffer of its own
+        :type scratch: bool
+        :return: raw HID frame with stream commands left to fill from offset 4
+        :rtype: :obj:`memoryview`, :obj:`bytearray`
+        """
+        frame_len = stream_length + 4
+        raw = self.__tx_view(frame_len) if scratch else bytearray(frame_len)
+        _HDR_CMD.pack_into(raw, 0, 0x00, stream_length + 2, 0xaa)
+
+        return raw
+
+    def __i2c_build_frame(self, data: bytes, read_len: int, scratch: bool = True) -> Any:
+        """
+        assemble an I2CStream HID frame
+        :param data: data to write
+        :type data: bytes
+        :param read_len: length of data to read (max 63B)
+        :type read_len: int
+        :param scratch: build the frame in the reusable transmit buffer (valid until next transfer),
+        otherwise in a buffer of its own
+        :type scratch: bool
+        :return: raw HID frame
+        :rtype: :obj:`memoryview`, :obj:`bytearray`
+        """
+        restart = read_len > 0 and len(data) > 1
+        try:
+            tail = _I2C_TAILS[read_len, restart]
+        except KeyError:
+            raise Exception("read length exceeded max size of 63 Bytes")
+        data_end = 6 + len(data)
+        raw = self.__i2c_stream_frame(len(data) + len(tail) + 2, scratch)
+        # START, OUT with the length of data
+        raw[4] = 0x74
+        raw[5] = len(data) | 0b1000_0000
+        raw[6:data_end] = data
+        raw[data_end:] = tail
+        if restart:
+            # restart with the reading address of the same device
+            raw[data_end + 2] = data[0] | 0x01
+
+        return raw
+
+    @staticmethod
+    def __i2c_parse_frame(feedback, data: bytes, read_len: int) -> Tuple[bool, memoryview]:
+        """
+        parse an I2CStream response frame
+        :param feedback: raw HID frame received
+        :type feedback: memoryview
+        :param data: data written by the request
+        :type data: bytes
+        :param read_len: length of data requested
+        :type read_len: int
+        :return: tuple(<bool status>, <memoryview feedback>), feedback views into the given frame
+        :rtype: (:obj:`bool`, :obj:`memoryview`)
+        """
+        payload_length = _HDR_LEN.unpack_from(feedback, 0)[0]
         ack_stops = len(data) + bool(read_len) + 2
         if len(data) == 1:
             ack_stops -= 1
-        ack_signals = feedback[2:ack_stops]
         payload = feedback[ack_stops: payload_length + 2]
-        # print("i2c package received:", feedback)
-        # print("i2c feedback payload length: {}, acks: {}, content: {}".format(payload_length, ack_signals,
-        #                                                                       feedback[:payload_length + 2]))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("i2c feedback payload length: %d, acks: %s, content: %s",
+                         payload_length, bytes(feedback[2:ack_stops]).hex(), bytes(feedback[:payload_length + 2]).hex())
 
-        return sum(ack_signals) == len(ack_signals), payload
+        return verify_acks(feedback, 2, ack_stops), payload
 
     # --*-- [ SPI ] --*--
     @__device_lock(2)
@@ -353,8 +900,7 @@ class CH347HIDDev(hid.device):
         :type is_16bits: bool
         :return:
         """
-        self.CS1_enabled = False
-        self.CS2_enabled = False
+        self.__cs_state = 0
         conf = SPIConfig()
         conf.set_mode(mode)
         conf.set_clockSpeed(clock_freq_level)
@@ -364,14 +910,58 @@ class CH347HIDDev(hid.device):
         conf.set_CS2Polar(CS2_high)
         conf.set_mode16bits(is_16bits)
         self.write(conf)
-        self.read(512, timeout_ms=200)
+        self.read(512, timeout_ms=_RX_TIMEOUT_MS)  # device responds to SPI initialization
         self.spi_initiated = True
 
     @__device_lock(2)
+    def set_CS(self, which: int, enable: bool = True, active_delay_us: int = -1,
+               deactivate_delay_us: int = -1):
+        """
+        set CS1 or CS2 enable/disable with delay settings, enabling one CS disables the other in the same frame
+        :param which: CS pin to set, 1 or 2
+        :type which: int
+        :param enable: enable/disable the CS pin
+        :type enable: bool
+        :param active_delay_us: delay for CS (in μs) to activate
+        :type active_delay_us: int
+        :param deactivate_delay_us: delay for CS (in μs) to deactivate
+        :type deactivate_delay_us: int
+        :return:
+        """
+        if which not in (1, 2):
+            raise ValueError("CS pin {} does not exist, expecting 1 or 2".format(which))
+        other = 3 - which
+
+        if active_delay_us >= 0:
+            self.cs_activate_delay = active_delay_us
+        if deactivate_delay_us >= 0:
+            self.cs_deactivate_delay = deactivate_delay_us
+        delays = (self.cs_activate_delay, self.cs_deactivate_delay)
+        if delays != self.__cs_frames_delays:
+            # frames cached are built with outdated delays
+            self.__cs_frames.clear()
+            self.__cs_frames_delays = delays
+
+        key = (which, enable, enable and self.__cs_state == other)
+        frame = self.__cs_frames.get(key)
+        if frame is None:
+            conf = CSConfig()
+            conf.set_activeDelay(delays[0])
+            conf.set_deactivateDelay(delays[1])
+            # configures the given CS and leaves the other one unchanged
+            (conf.set_CS1Enable if which == 1 else conf.set_CS2Enable)(enable)
+            if key[2]:
+                # deactivate the other CS in the same frame
+                conf.set_CS(other, False)
+            frame = self.__cs_frames[key] = conf.as_bytes()
+
+        self.write(frame)
+        self.__cs_state = which if enable else 0
+
     def set_CS1(self, enable: bool = True, active_delay_us: int = -1,
                 deactivate_delay_us: int = -1):
         """
-        set CS1 enable/disable with delay settings
+        set CS1 enable/disable with delay settings (deprecated, use set_CS(1, ...) instead)
         :param enable: enable/disable CS1
         :type enable: bool
         :param active_delay_us: delay for CS1 (in μs) to activate
@@ -380,29 +970,15 @@ class CH347HIDDev(hid.device):
         :type deactivate_delay_us: int
         :return:
         """
-        if enable and self.CS2_enabled:
-            self.set_CS2(enable=False)
-        if active_delay_us >= 0:
-            self.cs_activate_delay = active_delay_us
-        if deactivate_delay_us >= 0:
-            self.cs_deactivate_delay = deactivate_delay_us
-        conf = CSConfig()
-        conf.set_activeDelay(self.cs_activate_delay)
-        conf.set_deactivateDelay(self.cs_deactivate_delay)
-        conf.set_CS1Enable(enable)
-        self.write(conf)
-        if enable:
-            self.CS1_enabled = True
-            self.CS2_enabled = False
-        else:
-            self.CS1_enabled = False
-            self.CS2_enabled = False
+        if self.warnings_enabled:
+            warnings.warn("set_CS1 is deprecated and will be removed in future releases, use set_CS(1, ...) instead",
+                          DeprecationWarning)
+        self.set_CS(1, enable, active_delay_us, deactivate_delay_us)
 
-    @__device_lock(2)
     def set_CS2(self, enable: bool = True, active_delay_us: int = -1,
                 deactivate_delay_us: int = -1):
         """
-        set CS2 enable/disable with delay settings
+        set CS2 enable/disable with delay settings (deprecated, use set_CS(2, ...) instead)
         :param enable: enable/disable CS2
         :type enable: bool
         :param active_delay_us: delay for CS2 (in μs) to activate
@@ -411,115 +987,280 @@ class CH347HIDDev(hid.device):
         :type deactivate_delay_us: int
         :return:
         """
-        if enable and self.CS1_enabled:
-            self.set_CS1(enable=False)
-        if active_delay_us >= 0:
-            self.cs_activate_delay = active_delay_us
-        if deactivate_delay_us >= 0:
-            self.cs_deactivate_delay = deactivate_delay_us
-        conf = CSConfig()
-        conf.set_activeDelay(self.cs_activate_delay)
-        conf.set_deactivateDelay(self.cs_deactivate_delay)
-        conf.set_CS2Enable(enable)
-        self.write(conf)
-        if enable:
-            self.CS2_enabled = True
-            self.CS1_enabled = False
-        else:
-            self.CS1_enabled = False
-            self.CS2_enabled = False
+        if self.warnings_enabled:
+            warnings.warn("set_CS2 is deprecated and will be removed in future releases, use set_CS(2, ...) instead",
+                          DeprecationWarning)
+        self.set_CS(2, enable, active_delay_us, deactivate_delay_us)
 
-    @__device_lock(2)
-    def spi_write(self, data: bytes) -> int:
+    @__device_lock(2, __require_cs)
+    def spi_write(self, data: (list, bytes, bytearray, memoryview)) -> int:
         """
         write data to SPI devices
+        :param data: max length up to 32768 Bytes, any contiguous buffer is sent as its raw bytes without being copied
+        :type data: :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`, :obj:`list`
+        :return: int, length of sent data
+        :rtype: int
+        """
+        length = self.__spi_submit_write(data)
+        # device acknowledges every write, the ack must be taken or it is mistaken for the response of next read
+        self.read(512, timeout_ms=_RX_TIMEOUT_MS)
+
+        return length
+
+    @__device_lock(2)
+    def spi_write_with_cs(self, which: int, data: (list, bytes, bytearray, memoryview),
+                          keep_cs_active: bool = False) -> int:
+        """
+        write data to SPI devices with given CS activated, CS activation, SPI write and CS deactivation frames
+        are submitted back to back in one locked section and the write acknowledgement is collected last
+        :param which: CS pin to activate, 1 or 2
+        :type which: int
+        :param data: max length up to 32768 Bytes, any contiguous buffer is sent as its raw bytes without being copied
+        :type data: :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`, :obj:`list`
+        :param keep_cs_active: keep CS pin active after sending messages
+        :type keep_cs_active: bool
+        :return: int, length of sent data
+        :rtype: int
+        """
+        if self.__cs_state != which:
+            # activate the CS (the other CS is deactivated in the same frame)
+            self.set_CS(which)
+
+        length = self.__spi_submit_write(data)
+
+        if not keep_cs_active:
+            self.set_CS(which, False)
+        self.read(512, timeout_ms=_RX_TIMEOUT_MS)  # acknowledgement of SPI write
+
+        return length
+
+    def __spi_submit_write(self, data: (list, bytes, bytearray, memoryview)) -> int:
+        """
+        send an SPI write frame without collecting its acknowledgement
         :param data: max length up to 32768 Bytes
-        :type data: bytes
+        :type data: :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`, :obj:`list`
         :return: int, length of sent data
         :rtype: int
         """
-        if not (self.CS1_enabled or self.CS2_enabled):
-            raise Exception("no CS enabled yet")
+        data = _as_byte_view(data)
 
         length = len(data)
         if length > 32768:
             # exceeded max package size
             raise Exception("package size {} exceeded max size of 32768 Bytes".format(length))
 
-        raw = struct.pack("<BHBH", 0x00, length + 3, 0xc4, length) + data
+        raw = self.__tx_view(length + 6)
+        _HDR_SPI_W.pack_into(raw, 0, 0x00, length + 3, 0xc4, length)
+        raw[6:] = data
         self.write(raw)
-        self.read(512, timeout_ms=200)
 
         return length
 
-    @__device_lock(2)
-    def spi_read_write(self, data: bytes) -> list:
+    def spi_read_write(self, data: (list, bytes, bytearray, memoryview)) -> bytearray:
         """
         write data to SPI devices
-        :param data: bytes, max length up to 32768 bytes
-        :type data: bytes
-        :return: list of bytes received from SPI device
-        :rtype: list
+        :param data: max length up to 32768 bytes, any contiguous buffer is sent as its raw bytes without being copied
+        :type data: :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`, :obj:`list`
+        :return: data received from SPI device
+        :rtype: bytearray
         """
-        if not (self.CS1_enabled or self.CS2_enabled):
-            raise Exception("no CS enabled yet")
+        data = _as_byte_view(data)
+        ret = bytearray(len(data))
+        received = self.spi_read_write_into(data, ret)
+        if received < len(ret):
+            del ret[received:]
+
+        return ret
+
+    @__device_lock(2, __require_cs)
+    def spi_read_write_into(self, data: (list, bytes, bytearray, memoryview), out) -> int:
+        """
+        write data to SPI devices and receive the data read meanwhile into a caller-owned buffer
+        :param data: max length up to 32768 bytes, any contiguous buffer is sent as its raw bytes without being copied
+        :type data: :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`, :obj:`list`
+        :param out: writable buffer to receive data (e.g. bytearray, numpy array), no smaller than data
+        :type out: :obj:`bytearray`, :obj:`memoryview`
+        :return: length of data written into buffer
+        :rtype: int
+        """
+        data = _as_byte_view(data)
 
         length = len(data)
         if length > 32768:
             # exceeded max package size
             raise Exception("package size {} exceeded max size of 32768 Bytes".format(length))
 
-        sent = 0
-        while sent < length:
-            left = length - sent
-            if left >= 507:
-                frame_payload_length = 507
-            else:
-                frame_payload_length = left
-            raw = struct.pack("<BHBH", 0x00, frame_payload_length + 3, 0xc2, frame_payload_length) + \
-                  data[sent:sent + frame_payload_length]
-            sent += frame_payload_length
+        out = memoryview(out).cast("B")
+        if len(out) < length:
+            raise ValueError("buffer size {} is smaller than data length {}".format(len(out), length))
+        out = out[:length]
+
+        if 0 < length <= 507:
+            # single frame transaction
+            raw = self.__tx_view(length + 6)
+            _HDR_SPI_W.pack_into(raw, 0, 0x00, length + 3, 0xc2, length)
+            raw[6:] = data
             self.write(raw)
 
-        ret = []
-        while len(ret) < length:
-            frame = self.read(512, timeout_ms=200)
-            if not frame:
-                if self.warnings_enabled:
-                    warnings.warn("read incomplete, read {} bytes (expecting {} bytes)".format(len(ret), length))
-                break
-            frame_len, cmd_id, payload_len = struct.unpack("<HBH", bytes(frame[:5]))
-            ret += frame[5:5 + payload_len]
+            received = parse_spi_frame(self.__read_frame(timeout_ms=_RX_TIMEOUT_MS), out, 0)
+            if received < length:
+                self.__warn_partial(received, length)
+
+            return received
+
+        # assemble all frames (6 bytes header + 507 bytes payload max) back to back
+        raw = self.__tx_view(length + 6 * ((length + 506) // 507))
+        spi_split_and_pack(data, raw, 0xc2)
+
+        # drain response frames in the receiver thread while frames are still being submitted
+        receiving = self.__rx_worker().submit(self.__spi_read_frames, out)
+
+        # submit frames with no Python work in between
+        try:
+            for pos in range(0, len(raw), 513):
+                self.write(raw[pos:pos + 513])
+        except BaseException:
+            # stop the receiver and drop what is still coming before the device lock is released
+            self.__rx_cancelled = True
+            wait((receiving,))
+            self.__rx_cancelled = False
+            try:
+                self.__discard_frames()
+            except IOError:
+                pass
+            raise
+
+        return receiving.result()
+
+    def spi_read(self, length) -> bytearray:
+        """
+        read data from SPI device with given length
+        :param length: length of data to read (no more than 32768)
+        :type length: int
+        :return: data received from SPI device
+        :rtype: bytearray
+        """
+        ret = bytearray(length)
+        received = self.spi_read_into(ret)
+        if received < length:
+            del ret[received:]
 
         return ret
 
-    @__device_lock(2)
-    def spi_read(self, length) -> list:
+    @__device_lock(2, __require_cs)
+    def spi_read_into(self, buf, length: int = None) -> int:
         """
-        read data from SPI device with given length
-        :param length: length of data to read (no more than 32768)
+        read data from SPI device into a caller-owned buffer
+        :param buf: writable buffer to receive data (e.g. bytearray, numpy array)
+        :type buf: :obj:`bytearray`, :obj:`memoryview`
+        :param length: length of data to read (no more than 32768), default is the size of buffer
         :type length: int
-        :return: list of data received from SPI device
-        :rtype: list
+        :return: length of data written into buffer
+        :rtype: int
         """
-        if not (self.CS1_enabled or self.CS2_enabled):
-            raise Exception("no CS enabled yet")
+        buf = memoryview(buf).cast("B")
+        if length is None:
+            length = len(buf)
+        elif length > len(buf):
+            raise ValueError("buffer size {} is smaller than read length {}".format(len(buf), length))
 
         if length > 32768:
             # exceeded max package size
             raise Exception("package size {} exceeded max size of 32768 Bytes".format(length))
 
-        raw = struct.pack("<BHBHL", 0x00, 7, 0xc3, 4, length)
+        raw = self.__tx_view(10)
+        _HDR_SPI_R.pack_into(raw, 0, 0x00, 7, 0xc3, 4, length)
         self.write(raw)
 
+        return self.__spi_read_frames(buf[:length])
+
+    def spi_read_batch(self, count: int, length: int, depth: int = 2) -> List[bytearray]:
+        """
+        read data from SPI device several times with given length, see :meth:`spi_read_batch_into`
+        :param count: number of reads
+        :type count: int
+        :param length: length of data of each read (no more than 32768)
+        :type length: int
+        :param depth: number of read commands submitted ahead, default is 2
+        :type depth: int
+        :return: list of data received, stops at the first incomplete read
+        :rtype: list
+        """
+        ret = [bytearray(length) for _ in range(count)]
+        received = self.spi_read_batch_into(ret, depth)
+        del ret[len(received):]
+        if received and received[-1] < length:
+            del ret[-1][received[-1]:]
+
+        return ret
+
+    @__device_lock(2, __require_cs)
+    def spi_read_batch_into(self, buffers: list, depth: int = 2) -> List[int]:
+        """
+        read data from SPI device once for each caller-owned buffer, keeping the next read commands queued on the
+        device so it starts each read without waiting for the host to turn around, the same buffer may be given
+        several times to receive every read into it, the device lock is held for the whole batch since other transfers
+        cannot be interleaved with queued reads, threads sharing the device give up with TimeoutError after waiting
+        2 s for the lock so long batches on a shared device should be split
+        :param buffers: writable buffers to receive data (e.g. bytearray, numpy array), each no more than 32768 bytes
+        :type buffers: list
+        :param depth: number of read commands submitted ahead, default is 2
+        :type depth: int
+        :return: list of length of data written into each buffer, stops at the first incomplete read, the responses of
+        reads queued after it are discarded
+        :rtype: list
+        """
+        if depth < 1:
+            raise ValueError("depth should be at least 1, got {}".format(depth))
+
+        views = [memoryview(buf).cast("B") for buf in buffers]
+        cmds = {}  # read commands keyed by read length
+        for view in views:
+            length = len(view)
+            if length > 32768:
+                # exceeded max package size
+                raise Exception("package size {} exceeded max size of 32768 Bytes".format(length))
+            if length not in cmds:
+                cmd = bytearray(10)
+                _HDR_SPI_R.pack_into(cmd, 0, 0x00, 7, 0xc3, 4, length)
+                cmds[length] = cmd
+
+        submitted = min(depth, len(views))
+        for view in views[:submitted]:
+            self.write(cmds[len(view)])
+
         ret = []
-        while len(ret) < length:
-            frame = self.read(512, timeout_ms=200)
-            if not frame:
-                if self.warnings_enabled:
-                    warnings.warn("read incomplete, read {} bytes (expecting {} bytes)".format(len(ret), length))
+        for view in views:
+            received = self.__spi_read_frames(view, strict=True)
+            ret.append(received)
+            if received < len(view):
+                # stop re-arming and drop the responses of the reads still queued on the device
+                self.__discard_frames()
                 break
-            frame_len, cmd_id, payload_len = struct.unpack("<HBH", bytes(frame[:5]))
-            ret += frame[5:5 + payload_len]
+
+            if submitted < len(views):
+                # re-arm before the caller gets to process the data
+                self.write(cmds[len(views[submitted])])
+                submitted += 1
 
         return ret
+
+    def spi_read_as_array(self, length: int, dtype: str = "uint8"):
+        """
+        read data from SPI device with given length and return it as a numpy array viewing the received buffer
+        (requires numpy)
+        :param length: length of data to read in bytes (no more than 32768)
+        :type length: int
+        :param dtype: numpy data type of array elements, default is uint8
+        :type dtype: str
+        :return: array of data received from SPI device, an incomplete read is trimmed to whole elements
+        :rtype: numpy.ndarray
+        """
+        import numpy as np
+
+        ret = np.empty(length, dtype=np.uint8)
+        received = self.spi_read_into(ret)
+        # drop the trailing bytes of an incomplete element
+        received -= received % np.dtype(dtype).itemsize
+
+        return ret[:received].view(dtype)
@@ -7,7 +7,13 @@
 
 
 from typing import Any
-import struct
+
+# 7-bits device addresses converted with writing signal and reading signal
+_ADDR_WRITE = tuple(bytes([addr << 1]) for addr in range(128))
+_ADDR_READ = tuple(bytes([addr << 1 | 1]) for addr in range(128))
+
+# expected I2C ACK signals, sliced to the number of ACKs of a frame (510 max)
+_ACK_OK = memoryview(b"\x01" * 510)
 
 
 class I2CClockFreq:
@@ -24,15 +30,13 @@ def convert_i2c_address(addr: (int, bytes), read: bool = False) -> bytes:
     :param read: bool, False -> write, True -> read
     :return: bytes
     """
-    if isinstance(addr, int):
-        addr = addr << 1
-    else:
-        addr = addr[0] << 1
+    if not isinstance(addr, int):
+        addr = addr[0]
 
-    if read:
-        addr += 1
+    if not 0 <= addr < 128:
+        raise ValueError("I2C device address {} exceeded the range of 7-bits".format(addr))
 
-    return struct.pack('B', addr)
+    return (_ADDR_READ if read else _ADDR_WRITE)[addr]
 
 
 def convert_int_to_bytes(inputs: (int, bytes)) -> bytes:
@@ -42,12 +46,25 @@ def convert_int_to_bytes(inputs: (int, bytes)) -> bytes:
     :param inputs: Any[int, bytes]
     :return: bytes
     """
+    if isinstance(inputs, (bytes, bytearray, memoryview)):
+        return inputs
+
     if isinstance(inputs, int):
-        b_len = 0
-        data_copy = inputs
-        while data_copy:
-            b_len += 1
-            data_copy = data_copy // 256
-        inputs = inputs.to_bytes(b_len, 'big', signed=False)
+        # 0 is converted into one byte of b'\x00'
+        inputs = inputs.to_bytes(max(1, (inputs.bit_length() + 7) >> 3), 'big', signed=False)
 
     return inputs
+
+
+def verify_acks(feedback: memoryview, start: int, end: int) -> bool:
+    """
+    check that every I2C ACK signal in feedback[start:end] is set,
+    pure Python implementation used when the compiled extension is unavailable
+    :param feedback: I2C frame received
+    :param start: offset of first ACK signal
+    :param end: offset after last ACK signal
+    :return: bool, True if all ACKs are set
+    """
+    ack_signals = feedback[start:end]
+
+    return ack_signals == _ACK_OK[:len(ack_signals)]
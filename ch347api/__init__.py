@@ -5,7 +5,7 @@
 # Filename: __init__
 # Created on: 2022/11/11
 
-from .__device import CH347HIDDev, VENDOR_ID, PRODUCT_ID
+from .__device import CH347HIDDev, VENDOR_ID, PRODUCT_ID, invalidate_path_cache
 from .i2c import I2CDevice
 from .spi import SPIDevice
 from .uart import UARTDevice
@@ -5,6 +5,57 @@
 # Filename: hid
 # Created on: 2022/11/11
 
+import struct
+
+_HDR_SPI_FRAME = struct.Struct("<BHBH")  # report ID, length, SPI cmd, payload length
+_U16 = struct.Struct("<H")  # little-endian 16-bit field of SPIConfig
+_CS_BLOCK = struct.Struct("<BHH")  # CS enable flag, activate delay, deactivate delay
+_RX_PAYLEN = struct.Struct("<3xH")  # payload length of received SPI frame (skipping length and cmd)
+
+# SPIConfig bytes [12:16] of SPI mode 0-3
+_SPI_MODE_BYTES = (b"\x00\x00\x00\x00", b"\x00\x00\x01\x00", b"\x02\x00\x00\x00", b"\x02\x00\x01\x00")
+# SPIConfig byte [18] of SPI clock speed level 0-7
+_SPI_SPEED_BYTES = (0x00, 0x08, 0x10, 0x18, 0x20, 0x28, 0x30, 0x38)
+
+
+def spi_split_and_pack(data: bytes, out: bytearray, cmd: int) -> int:
+    """
+    split data into SPI frames (507 bytes of payload max) and pack them back to back into the output buffer,
+    pure Python implementation used when the compiled extension is unavailable
+    :param data: data to send
+    :param out: output buffer, no less than len(data) + 6 * frame count bytes
+    :param cmd: SPI command ID of every frame
+    :return: int, length of packed frames
+    """
+    length = len(data)
+    sent = 0
+    pos = 0
+    while sent < length:
+        frame_payload_length = min(length - sent, 507)
+        _HDR_SPI_FRAME.pack_into(out, pos, 0x00, frame_payload_length + 3, cmd, frame_payload_length)
+        out[pos + 6:pos + 6 + frame_payload_length] = data[sent:sent + frame_payload_length]
+        sent += frame_payload_length
+        pos += frame_payload_length + 6
+
+    return pos
+
+
+def parse_spi_frame(frame: memoryview, out: memoryview, off: int) -> int:
+    """
+    copy the payload of a received SPI frame into the output buffer at given offset,
+    pure Python implementation used when the compiled extension is unavailable
+    :param frame: SPI frame received, [length 2B][cmd 1B][payload length 2B][payload]
+    :param out: output buffer
+    :param off: offset in output buffer to copy payload to
+    :return: int, length of payload copied (clamped to the space left in output buffer)
+    """
+    if len(frame) < 5:
+        return 0
+    payload_length = min(_RX_PAYLEN.unpack_from(frame, 0)[0], len(frame) - 5, len(out) - off)
+    out[off:off + payload_length] = frame[5:5 + payload_length]
+
+    return payload_length
+
 
 class SPIClockFreq:
     f_60M = 0
@@ -17,7 +68,7 @@ class SPIClockFreq:
     f_468K75 = 7
 
 
-class SPIConfig(list):
+class SPIConfig(bytearray):
 
     def __init__(self):
         super(SPIConfig, self).__init__(
@@ -36,16 +87,9 @@ class SPIConfig(list):
         :param mode: int, can only be 0, 1, 2, 3
         :return: None
         """
-        if mode == 0:
-            self[12:16] = b"\x00\x00\x00\x00"
-        elif mode == 1:
-            self[12:16] = b"\x00\x00\x01\x00"
-        elif mode == 2:
-            self[12:16] = b"\x02\x00\x00\x00"
-        elif mode == 3:
-            self[12:16] = b"\x02\x00\x01\x00"
-        else:
+        if not 0 <= mode <= 3:
             raise Exception("SPI mode value needs to be one of 0-3")
+        self[12:16] = _SPI_MODE_BYTES[mode]
 
     def set_clockSpeed(self, speed_ind: int):
         """
@@ -53,24 +97,9 @@ class SPIConfig(list):
         :param speed_ind: int, 0, 1, 2, 3, 4, 5, 6, 7
         :return: None
         """
-        if speed_ind == 0:
-            self[18] = 0x00
-        elif speed_ind == 1:
-            self[18] = 0x08
-        elif speed_ind == 2:
-            self[18] = 0x10
-        elif speed_ind == 3:
-            self[18] = 0x18
-        elif speed_ind == 4:
-            self[18] = 0x20
-        elif speed_ind == 5:
-            self[18] = 0x28
-        elif speed_ind == 6:
-            self[18] = 0x30
-        elif speed_ind == 7:
-            self[18] = 0x38
-        else:
-            raise Exception("SPI mode value needs to be one of 0-7")
+        if not 0 <= speed_ind <= 7:
+            raise Exception("SPI clock speed value needs to be one of 0-7")
+        self[18] = _SPI_SPEED_BYTES[speed_ind]
 
     def set_MSB(self, is_msb: bool = False):
         """
@@ -89,7 +118,9 @@ class SPIConfig(list):
         :param us: int, 0-65535
         :return: None
         """
-        self[24:26] = us.to_bytes(2, "little", signed=False)
+        if not 0 <= us <= 65535:
+            raise Exception("SPI write read interval value needs to be in range 0-65535")
+        _U16.pack_into(self, 24, us)
 
     def set_CS1Polar(self, high: bool = False):
         """
@@ -125,7 +156,7 @@ class SPIConfig(list):
             self[11] = 0x00
 
 
-class CSConfig(list):
+class CSConfig(bytearray):
 
     def __init__(self):
         super(CSConfig, self).__init__(
@@ -139,7 +170,7 @@ class CSConfig(list):
 
     def as_bytes(self) -> bytes:
         """
-        export data list as bytes
+        export configuration as bytes
         :return: bytes
         """
         return bytes(self)
@@ -150,16 +181,9 @@ class CSConfig(list):
         :param enable: bool, default = True
         :return: None
         """
-        if enable:
-            self[5:32] = b"\x00\x80" + \
-                         self.active_delay_us.to_bytes(2, "little", signed=False) + \
-                         self.deactive_delay_us.to_bytes(2, "little", signed=False) + \
-                         b"\x00" * 5
-        else:
-            self[5:32] = b"\x00\xc0" + \
-                         self.active_delay_us.to_bytes(2, "little", signed=False) + \
-                         self.deactive_delay_us.to_bytes(2, "little", signed=False) + \
-                         b"\x00" * 5
+        # clear both CS blocks (no change) before configuring CS1
+        self[5:32] = bytes(11)
+        self.set_CS(1, enable)
 
     def set_CS2Enable(self, enable: bool = True):
         """
@@ -167,14 +191,23 @@ class CSConfig(list):
         :param enable: bool, default = True
         :return: None
         """
-        if enable:
-            self[5:32] = b"\x00" * 5 + b"\x00\x80" + \
-                         self.active_delay_us.to_bytes(2, "little", signed=False) + \
-                         self.deactive_delay_us.to_bytes(2, "little", signed=False)
-        else:
-            self[5:32] = b"\x00" * 5 + b"\x00\xc0" + \
-                         self.active_delay_us.to_bytes(2, "little", signed=False) + \
-                         self.deactive_delay_us.to_bytes(2, "little", signed=False)
+        # clear both CS blocks (no change) before configuring CS2
+        self[5:32] = bytes(11)
+        self.set_CS(2, enable)
+
+    def set_CS(self, cs: int, enable: bool = True):
+        """
+        set enable/disable of one Chip-Select pin, leaving the setting of the other pin in place
+        so that both pins can be configured in one frame
+        :param cs: int, Chip-Select pin 1 or 2
+        :param enable: bool, default = True
+        :return: None
+        """
+        if cs not in (1, 2):
+            raise ValueError("CS pin {} does not exist, expecting 1 or 2".format(cs))
+        del self[16:]
+        _CS_BLOCK.pack_into(self, 6 if cs == 1 else 11, 0x80 if enable else 0xc0,
+                            self.active_delay_us, self.deactive_delay_us)
 
     def set_activeDelay(self, us: int):
         """
@@ -0,0 +1,94 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# -*- coding: utf-8 -*-
+# Author: i2cy(i2cy@outlook.com)
+# Project: CH347-HIDAPI
+# Filename: _fast
+# Created on: 2026/10/15
+
+from libc.string cimport memcpy
+
+
+def spi_split_and_pack(const unsigned char[:] data, unsigned char[:] out, unsigned char cmd) -> int:
+    """
+    split data into SPI frames (507 bytes of payload max) and pack them back to back into the output buffer
+    :param data: data to send
+    :param out: output buffer, no less than len(data) + 6 * frame count bytes
+    :param cmd: SPI command ID of every frame
+    :return: int, length of packed frames
+    """
+    cdef Py_ssize_t length = data.shape[0]
+    cdef Py_ssize_t sent = 0
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t frame_payload_length
+    cdef unsigned char *dst
+
+    if out.shape[0] < length + 6 * ((length + 506) // 507):
+        raise ValueError("output buffer too small for {} bytes of SPI payload".format(length))
+
+    with nogil:
+        while sent < length:
+            frame_payload_length = length - sent
+            if frame_payload_length > 507:
+                frame_payload_length = 507
+            dst = &out[pos]
+            dst[0] = 0x00
+            dst[1] = (frame_payload_length + 3) & 0xff
+            dst[2] = (frame_payload_length + 3) >> 8
+            dst[3] = cmd
+            dst[4] = frame_payload_length & 0xff
+            dst[5] = frame_payload_length >> 8
+            memcpy(dst + 6, &data[sent], frame_payload_length)
+            sent += frame_payload_length
+            pos += frame_payload_length + 6
+
+    return pos
+
+
+def parse_spi_frame(const unsigned char[:] frame, unsigned char[:] out, Py_ssize_t off) -> int:
+    """
+    copy the payload of a received SPI frame into the output buffer at given offset
+    :param frame: SPI frame received, [length 2B][cmd 1B][payload length 2B][payload]
+    :param out: output buffer
+    :param off: offset in output buffer to copy payload to
+    :return: int, length of payload copied (clamped to the space left in output buffer)
+    """
+    cdef Py_ssize_t payload_length
+
+    if frame.shape[0] < 5:
+        return 0
+    if off < 0 or off > out.shape[0]:
+        raise ValueError("offset {} out of output buffer range".format(off))
+
+    with nogil:
+        payload_length = frame[3] | frame[4] << 8
+        if payload_length > frame.shape[0] - 5:
+            payload_length = frame.shape[0] - 5
+        if payload_length > out.shape[0] - off:
+            payload_length = out.shape[0] - off
+        if payload_length > 0:
+            memcpy(&out[off], &frame[5], payload_length)
+
+    return payload_length
+
+
+def verify_acks(const unsigned char[:] feedback, Py_ssize_t start, Py_ssize_t end) -> bool:
+    """
+    check that every I2C ACK signal in feedback[start:end] is set
+    :param feedback: I2C frame received
+    :param start: offset of first ACK signal
+    :param end: offset after last ACK signal
+    :return: bool, True if all ACKs are set
+    """
+    cdef Py_ssize_t i
+    cdef bint ok = True
+
+    if end > feedback.shape[0]:
+        end = feedback.shape[0]
+
+    with nogil:
+        for i in range(start, end):
+            if feedback[i] != 0x01:
+                ok = False
+                break
+
+    return ok
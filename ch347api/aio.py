@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: i2cy(i2cy@outlook.com)
+# Project: CH347-HIDAPI
+# Filename: aio
+# Created on: 2026/10/15
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial, wraps
+
+
+class AsyncDevice:
+
+    def __init__(self, device, executor: Executor = None):
+        """
+        Wrap a device object (CH347HIDDev, SPIDevice, I2CDevice or UARTDevice) so that its methods return awaitables,
+        every call runs in a worker thread and the device lock keeps commands on a shared CH347HIDDev serialized, so
+        transfers on different buses can be awaited together with asyncio.gather
+        :param device: device object to wrap
+        :type device: :obj:`CH347HIDDev`, :obj:`SPIDevice`, :obj:`I2CDevice`, :obj:`UARTDevice`
+        :param executor: executor to run the calls in, default is the default executor of the event loop
+        :type executor: Executor, optional
+        """
+        self.device = device
+        self.__executor = executor
+
+    def __getattr__(self, name):
+        if name == "device" or name.startswith("_AsyncDevice__"):
+            # not set yet (e.g. __init__ failed or while unpickling), avoid looking it up through itself
+            raise AttributeError(name)
+        attr = getattr(self.device, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        async def call(*args, **kwargs):
+            return await asyncio.get_running_loop().run_in_executor(self.__executor, partial(attr, *args, **kwargs))
+
+        return call
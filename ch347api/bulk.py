@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: i2cy(i2cy@outlook.com)
+# Project: CH347-HIDAPI
+# Filename: bulk
+# Created on: 2026/10/15
+
+import errno
+import queue
+import struct
+import threading
+
+import usb.core
+import usb.util
+
+from .__device import CH347HIDDev, VENDOR_ID
+
+BULK_PRODUCT_ID: int = 21979  # CH347 in mode 1 (vendor SPI/I2C/GPIO interface with bulk endpoints)
+BULK_INTERFACE_NUM: int = 2
+
+_HDR_LEN = struct.Struct("<H")
+_READ_AHEAD_WAIT_MS = 50  # time for the read-ahead thread to wait for data before checking if it is still alive
+
+
+class CH347BulkDev(CH347HIDDev):
+
+    def __init__(self, vendor_id=VENDOR_ID, product_id=BULK_PRODUCT_ID, interface_num=BULK_INTERFACE_NUM,
+                 enable_device_lock=True, warnings_enabled=True, read_ahead=True):
+        """
+        Class of CH347 SPI interface over the bulk endpoints of the vendor interface (experimental, requires pyusb),
+        frames are translated from and to the HID frame layout so that the SPI methods of CH347HIDDev work unchanged,
+        I2C is not supported since I2C streams rely on the zero padding of HID reports for their END command
+        :param vendor_id: the vendor ID of the device
+        :type vendor_id: int
+        :param product_id: the product ID of the device
+        :type product_id: int
+        :param interface_num: the number of the vendor interface
+        :type interface_num: int
+        :param enable_device_lock: whether to enable device in case of multithreading communication
+        :type enable_device_lock: bool
+        :param warnings_enabled: whether to enable warnings output
+        :type warnings_enabled: bool
+        :param read_ahead: keep a bulk IN transfer posted by a receiver thread so that the device can send the next
+        frame while the previous one is processed, default is True
+        :type read_ahead: bool
+        """
+        self.__interface_num = interface_num
+        self.__read_ahead = read_ahead
+        self.__rx_queue = queue.Queue()
+        self.__rx_thread = None
+        self.__usb_dev = None
+        self.__ep_out = None
+        self.__ep_in = None
+
+        super(CH347BulkDev, self).__init__(vendor_id, product_id, enable_device_lock=enable_device_lock,
+                                           warnings_enabled=warnings_enabled)
+
+    def _open_interface(self, vendor_id: int, product_id: int):
+        """
+        find the device and claim its vendor interface
+        :param vendor_id: the vendor ID of the device
+        :type vendor_id: int
+        :param product_id: the product ID of the device
+        :type product_id: int
+        :return:
+        """
+        dev = usb.core.find(idVendor=vendor_id, idProduct=product_id)
+        if dev is None:
+            raise IOError("no CH347 device found with vendor ID {:04x} and product ID {:04x}".format(
+                vendor_id, product_id))
+
+        intf = dev.get_active_configuration()[(self.__interface_num, 0)]
+        usb.util.claim_interface(dev, self.__interface_num)
+        self.__ep_out = usb.util.find_descriptor(
+            intf, custom_match=lambda ep: usb.util.endpoint_direction(ep.bEndpointAddress) == usb.util.ENDPOINT_OUT)
+        self.__ep_in = usb.util.find_descriptor(
+            intf, custom_match=lambda ep: usb.util.endpoint_direction(ep.bEndpointAddress) == usb.util.ENDPOINT_IN)
+        if self.__ep_out is None or self.__ep_in is None:
+            usb.util.dispose_resources(dev)
+            raise IOError("bulk endpoints not found on interface {}".format(self.__interface_num))
+
+        self.__usb_dev = dev
+
+        if self.__read_ahead:
+            self.__rx_thread = threading.Thread(target=self.__read_ahead_thread, name="ch347-bulk-rx", daemon=True)
+            self.__rx_thread.start()
+
+    def __read_ahead_thread(self):
+        """
+        receive frames from the bulk IN endpoint continuously and queue them for read()
+        :return:
+        """
+        while self.__usb_dev is not None:
+            try:
+                data = self.__ep_in.read(510, timeout=_READ_AHEAD_WAIT_MS)
+            except usb.core.USBError as err:
+                if err.errno == errno.ETIMEDOUT:
+                    continue
+                if self.__usb_dev is not None:
+                    # hand the failure to the reader
+                    self.__rx_queue.put(err)
+                break
+            self.__rx_queue.put(data)
+
+    def init_I2C(self, clock_freq_level: int = 1):
+        """
+        I2C is not supported over the bulk endpoints
+        :param clock_freq_level: 0-20KHz, 1-100KHz, 2-400KHz, 3-750KHz
+        :type clock_freq_level: int
+        :return:
+        """
+        raise Exception("I2C is not supported by CH347BulkDev, use CH347HIDDev instead")
+
+    def write(self, buff) -> int:
+        """
+        send a HID frame through the bulk OUT endpoint
+        :param buff: HID frame, [report ID 1B][length 2B][command], sent as [command] without report ID and length
+        :type buff: :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`
+        :return: length of data written (HID frame layout)
+        :rtype: int
+        """
+        # report ID and frame length are not part of bulk commands
+        return self.__ep_out.write(memoryview(buff)[3:]) + 3
+
+    def read(self, max_length: int, timeout_ms: int = 0) -> bytearray:
+        """
+        receive a frame from the bulk IN endpoint in HID frame layout
+        :param max_length: maximum length of the frame
+        :type max_length: int
+        :param timeout_ms: timeout in milliseconds, 0 for blocking read
+        :type timeout_ms: int
+        :return: frame received, [length 2B][response], empty if nothing received
+        :rtype: bytearray
+        """
+        if self.__rx_thread is not None:
+            try:
+                data = self.__rx_queue.get(timeout=timeout_ms / 1000 if timeout_ms else None)
+            except queue.Empty:
+                return bytearray()
+            if isinstance(data, Exception):
+                # the receiver thread has stopped, keep failing every following read
+                self.__rx_queue.put(data)
+                raise data
+            data = data[:max_length - 2]
+
+        else:
+            try:
+                data = self.__ep_in.read(max_length - 2, timeout=timeout_ms)
+            except usb.core.USBError as err:
+                if err.errno != errno.ETIMEDOUT:
+                    raise
+                return bytearray()
+
+        frame = bytearray(len(data) + 2)
+        _HDR_LEN.pack_into(frame, 0, len(data))
+        frame[2:] = data
+
+        return frame
+
+    def close(self):
+        """
+        close device and release the vendor interface
+        :return:
+        """
+        dev = self.__usb_dev
+        if dev is not None:
+            self.__usb_dev = None
+            if self.__rx_thread is not None:
+                self.__rx_thread.join()
+                self.__rx_thread = None
+            usb.util.release_interface(dev, self.__interface_num)
+            usb.util.dispose_resources(dev)
+        super(CH347BulkDev, self).close()
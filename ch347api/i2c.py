@@ -8,7 +8,7 @@
 
 from .__device import CH347HIDDev
 from .__i2c import convert_int_to_bytes
-from typing import Tuple, Any
+from typing import Tuple, Any, List
 
 
 class I2CDevice:
@@ -39,7 +39,8 @@ class I2CDevice:
         Write data to the device through I2C bus
         :param reg: address of the register, or None for direct transmission
         :type reg: :obj:`int`, :obj:`bytes`
-        :param data: data to send, or None for write probing
+        :param data: data to send, or None for write probing, several bytes are written to consecutive registers
+        in one transaction if the device increments its register address
         :type data: :obj:`int`, :obj:`bytes`
         :return: operation status
         """
@@ -52,6 +53,26 @@ class I2CDevice:
 
         return self.dev.i2c_write(self.addr, data=payload)
 
+    def write_batch(self, requests: List[Tuple[Any, Any]]) -> List[bool]:
+        """
+        Write to several registers of the device through I2C bus, the writes are sent in as few frames as possible
+        :param requests: list of (reg, data) in the same form as :meth:`write`
+        :type requests: list
+        :return: list of operation status in request order
+        :rtype: list
+        """
+        payloads = []
+        for reg, data in requests:
+            payload = b""
+            if reg is not None:
+                payload += convert_int_to_bytes(reg)
+
+            if data is not None:
+                payload += convert_int_to_bytes(data)
+            payloads.append((self.addr, payload))
+
+        return self.dev.i2c_write_batch(payloads)
+
     def read(self, reg: (int, bytes) = None, length: int = 0):
         """
         Read data from the device through I2C bus
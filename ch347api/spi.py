@@ -16,7 +16,8 @@ class SPIDevice:
                  mode: int = 0, write_read_interval: int = 0,
                  CS1_high: bool = False, CS2_high: bool = False,
                  is_16bits: bool = False,
-                 ch347_device: CH347HIDDev = None):
+                 ch347_device: CH347HIDDev = None,
+                 prefer_bulk: bool = False):
         """
         Encapsulated class of SPI device
         :param clock_freq_level: clock freq, 0=60M, 1=30M, 2=15M, 3=7.5M, 4=3.75M, 5=1.875M, 6=937.5K，7=468.75K
@@ -35,7 +36,19 @@ class SPIDevice:
         :type is_16bits: bool
         :param ch347_device: (defaults to None), will create a new CH347HIDDev if unset
         :type ch347_device: CH347HIDDev, optional
+        :param prefer_bulk: try the experimental bulk endpoints of the vendor interface (chip in mode 1, requires the
+        `bulk` extra) first when creating a new device, HID is used if pyusb is not installed or the vendor
+        interface is not found, default is False
+        :type prefer_bulk: bool
         """
+        if ch347_device is None and prefer_bulk:
+            try:
+                from .bulk import CH347BulkDev
+                ch347_device = CH347BulkDev()
+            except (ImportError, IOError, ValueError):
+                # pyusb missing, no libusb backend (usb.core.NoBackendError is a ValueError) or no vendor interface
+                pass
+
         if ch347_device is None:
             # create new CH347 HID device port if unset
             ch347_device = CH347HIDDev()
@@ -46,152 +59,296 @@ class SPIDevice:
                               write_read_interval=write_read_interval, CS1_high=CS1_high, CS2_high=CS2_high,
                               is_16bits=is_16bits)
 
-    def write_CS1(self, data: (list, bytes), keep_cs_active: bool = False) -> int:
+    def write_CS1(self, data: (list, bytes, bytearray, memoryview), keep_cs_active: bool = False) -> int:
         """
         Write data to SPI bus with CS1 activated
         :param data: max length up to 32768 bytes at one time
-        :type data: :obj:`list`, :obj:`bytes`
+        :type data: :obj:`list`, :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`
         :param keep_cs_active: keep CS pin active after sending messages
         :type keep_cs_active: bool
         :return: length of sent data
         :rtype: int
         """
-        if self.dev.CS2_enabled:
-            # deactivate CS2 if activated
-            self.dev.set_CS2(False)
+        return self.dev.spi_write_with_cs(1, data, keep_cs_active)
 
+    def read_CS1(self, length: int, keep_cs_active: bool = False) -> bytearray:
+        """
+        Read data from SPI bus with CS1 activated and return data received
+        :param length: length of data to read
+        :type length: int
+        :param keep_cs_active: keep CS pin active after sending messages
+        :type keep_cs_active: bool
+        :return: data received
+        :rtype: bytearray
+        """
         if not self.dev.CS1_enabled:
-            # activate CS1 if not
-            self.dev.set_CS1(True)
+            # activate CS1 if not (CS2 is deactivated in the same frame)
+            self.dev.set_CS(1)
 
-        ret = self.dev.spi_write(bytes(data))
+        ret = self.dev.spi_read(length)
 
         if not keep_cs_active:
-            self.dev.set_CS1(False)
+            self.dev.set_CS(1, False)
 
         return ret
 
-    def read_CS1(self, length: int, keep_cs_active: bool = False) -> list:
+    def read_CS1_into(self, buf, length: int = None, keep_cs_active: bool = False) -> int:
         """
-        Read data from SPI bus with CS1 activated and return list of bytes received
-        :param length: length of data to read
+        Read data from SPI bus with CS1 activated into a caller-owned buffer
+        :param buf: writable buffer to receive data (e.g. bytearray, numpy array)
+        :type buf: :obj:`bytearray`, :obj:`memoryview`
+        :param length: length of data to read, default is the size of buffer
         :type length: int
         :param keep_cs_active: keep CS pin active after sending messages
         :type keep_cs_active: bool
-        :return: list of bytes received
-        :rtype: list
+        :return: length of data received
+        :rtype: int
         """
-        if self.dev.CS2_enabled:
-            # deactivate CS2 if activated
-            self.dev.set_CS2(False)
+        if not self.dev.CS1_enabled:
+            # activate CS1 if not (CS2 is deactivated in the same frame)
+            self.dev.set_CS(1)
+
+        ret = self.dev.spi_read_into(buf, length)
 
+        if not keep_cs_active:
+            self.dev.set_CS(1, False)
+
+        return ret
+
+    def read_CS1_batch(self, count: int, length: int, keep_cs_active: bool = False) -> list:
+        """
+        Read data from SPI bus with CS1 activated for several times, CS1 stays active between the reads and the
+        device is locked for the whole batch (see :meth:`CH347HIDDev.spi_read_batch_into`)
+        :param count: number of reads
+        :type count: int
+        :param length: length of data of each read
+        :type length: int
+        :param keep_cs_active: keep CS pin active after sending messages
+        :type keep_cs_active: bool
+        :return: list of data received
+        :rtype: list
+        """
         if not self.dev.CS1_enabled:
-            # activate CS1 if not
-            self.dev.set_CS1(True)
+            # activate CS1 if not (CS2 is deactivated in the same frame)
+            self.dev.set_CS(1)
 
-        ret = self.dev.spi_read(length)
+        ret = self.dev.spi_read_batch(count, length)
 
         if not keep_cs_active:
-            self.dev.set_CS1(False)
+            self.dev.set_CS(1, False)
 
         return ret
 
-    def writeRead_CS1(self, data: (list, bytes), keep_cs_active: bool = False) -> list:
+    def read_CS1_batch_into(self, buffers: list, keep_cs_active: bool = False) -> list:
         """
-        Write and read data through SPI bus with CS1 activated and return list of bytes
-        :param data: data to write
-        :type data: :obj:`list`, :obj:`bytes`
-        :param keep_cs_active: keep CS1 pin active after sending messages
+        Read data from SPI bus with CS1 activated once for each caller-owned buffer, CS1 stays active between the
+        reads and the device is locked for the whole batch (see :meth:`CH347HIDDev.spi_read_batch_into`), the same
+        buffer may be given several times to receive every read into it
+        :param buffers: writable buffers to receive data (e.g. bytearray, numpy array)
+        :type buffers: list
+        :param keep_cs_active: keep CS pin active after sending messages
         :type keep_cs_active: bool
-        :return: list of bytes received
+        :return: list of length of data received into each buffer
         :rtype: list
         """
-        if self.dev.CS2_enabled:
-            # deactivate CS2 if activated
-            self.dev.set_CS2(False)
+        if not self.dev.CS1_enabled:
+            # activate CS1 if not (CS2 is deactivated in the same frame)
+            self.dev.set_CS(1)
+
+        ret = self.dev.spi_read_batch_into(buffers)
+
+        if not keep_cs_active:
+            self.dev.set_CS(1, False)
+
+        return ret
 
+    def writeRead_CS1(self, data: (list, bytes, bytearray, memoryview), keep_cs_active: bool = False) -> bytearray:
+        """
+        Write and read data through SPI bus with CS1 activated and return data received
+        :param data: data to write, bytes-like objects are sent without being copied
+        :type data: :obj:`list`, :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`
+        :param keep_cs_active: keep CS1 pin active after sending messages
+        :type keep_cs_active: bool
+        :return: data received
+        :rtype: bytearray
+        """
         if not self.dev.CS1_enabled:
-            # activate CS1 if not
-            self.dev.set_CS1(True)
+            # activate CS1 if not (CS2 is deactivated in the same frame)
+            self.dev.set_CS(1)
 
         ret = self.dev.spi_read_write(data)
 
         if not keep_cs_active:
-            self.dev.set_CS1(False)
+            self.dev.set_CS(1, False)
+
+        return ret
+
+    def writeRead_CS1_into(self, data: (list, bytes, bytearray, memoryview), out, keep_cs_active: bool = False) -> int:
+        """
+        Write and read data through SPI bus with CS1 activated, receiving data into a caller-owned buffer
+        :param data: data to write, bytes-like objects are sent without being copied
+        :type data: :obj:`list`, :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`
+        :param out: writable buffer to receive data (e.g. bytearray), no smaller than data
+        :type out: :obj:`bytearray`, :obj:`memoryview`
+        :param keep_cs_active: keep CS1 pin active after sending messages
+        :type keep_cs_active: bool
+        :return: length of data received
+        :rtype: int
+        """
+        if not self.dev.CS1_enabled:
+            # activate CS1 if not (CS2 is deactivated in the same frame)
+            self.dev.set_CS(1)
+
+        ret = self.dev.spi_read_write_into(data, out)
+
+        if not keep_cs_active:
+            self.dev.set_CS(1, False)
 
         return ret
 
-    def write_CS2(self, data: (list, bytes), keep_cs_active: bool = False) -> int:
+    def write_CS2(self, data: (list, bytes, bytearray, memoryview), keep_cs_active: bool = False) -> int:
         """
         Write data to SPI bus with CS2 activated
         :param data: max length up to 32768 bytes at one time
-        :type data: :obj:`list`, :obj:`bytes`
+        :type data: :obj:`list`, :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`
         :param keep_cs_active: bool, keep CS pin active after sending messages
         :type keep_cs_active: bool
         :return: length of sent data
         :rtype: int
         """
-        if self.dev.CS1_enabled:
-            # deactivate CS1 if activated
-            self.dev.set_CS1(False)
+        return self.dev.spi_write_with_cs(2, data, keep_cs_active)
+
+    def read_CS2(self, length: int, keep_cs_active: bool = False) -> bytearray:
+        """
+        Read data from SPI bus with CS2 activated and return data received
+        :param length: length of data to read
+        :type length: intr sending messages
+        :type keep_cs_active: bool
+        :param keep_cs_active: keep CS pin active afte
+        :return: data received
+        :rtype: bytearray
+        """
+        if not self.dev.CS2_enabled:
+            # activate CS2 if not (CS1 is deactivated in the same frame)
+            self.dev.set_CS(2)
+
+        ret = self.dev.spi_read(length)
+
+        if not keep_cs_active:
+            self.dev.set_CS(2, False)
+
+        return ret
 
+    def read_CS2_into(self, buf, length: int = None, keep_cs_active: bool = False) -> int:
+        """
+        Read data from SPI bus with CS2 activated into a caller-owned buffer
+        :param buf: writable buffer to receive data (e.g. bytearray, numpy array)
+        :type buf: :obj:`bytearray`, :obj:`memoryview`
+        :param length: length of data to read, default is the size of buffer
+        :type length: int
+        :param keep_cs_active: keep CS pin active after sending messages
+        :type keep_cs_active: bool
+        :return: length of data received
+        :rtype: int
+        """
         if not self.dev.CS2_enabled:
-            # activate CS2 if not
-            self.dev.set_CS2(True)
+            # activate CS2 if not (CS1 is deactivated in the same frame)
+            self.dev.set_CS(2)
 
-        ret = self.dev.spi_write(bytes(data))
+        ret = self.dev.spi_read_into(buf, length)
 
         if not keep_cs_active:
-            self.dev.set_CS2(False)
+            self.dev.set_CS(2, False)
 
         return ret
 
-    def read_CS2(self, length: int, keep_cs_active: bool = False) -> list:
+    def read_CS2_batch(self, count: int, length: int, keep_cs_active: bool = False) -> list:
         """
-        Read data from SPI bus with CS2 activated and return list of bytes received
-        :param length: length of data to read
-        :type length: intr sending messages
+        Read data from SPI bus with CS2 activated for several times, CS2 stays active between the reads and the
+        device is locked for the whole batch (see :meth:`CH347HIDDev.spi_read_batch_into`)
+        :param count: number of reads
+        :type count: int
+        :param length: length of data of each read
+        :type length: int
+        :param keep_cs_active: keep CS pin active after sending messages
         :type keep_cs_active: bool
-        :param keep_cs_active: keep CS pin active afte
-        :return: list of bytes received
+        :return: list of data received
         :rtype: list
         """
-        if self.dev.CS1_enabled:
-            # deactivate CS1 if activated
-            self.dev.set_CS1(False)
-
         if not self.dev.CS2_enabled:
-            # activate CS2 if not
-            self.dev.set_CS2(True)
+            # activate CS2 if not (CS1 is deactivated in the same frame)
+            self.dev.set_CS(2)
 
-        ret = self.dev.spi_read(length)
+        ret = self.dev.spi_read_batch(count, length)
 
         if not keep_cs_active:
-            self.dev.set_CS2(False)
+            self.dev.set_CS(2, False)
 
         return ret
 
-    def writeRead_CS2(self, data: (list, bytes), keep_cs_active: bool = False) -> list:
+    def read_CS2_batch_into(self, buffers: list, keep_cs_active: bool = False) -> list:
         """
-        Write and read data through SPI bus with CS2 activated and return list of bytes
-        :param data: data to write
-        :type data: :obj:`list`, :obj:`bytes`
-        :param keep_cs_active: keep CS1 pin active after sending messages
+        Read data from SPI bus with CS2 activated once for each caller-owned buffer, CS2 stays active between the
+        reads and the device is locked for the whole batch (see :meth:`CH347HIDDev.spi_read_batch_into`), the same
+        buffer may be given several times to receive every read into it
+        :param buffers: writable buffers to receive data (e.g. bytearray, numpy array)
+        :type buffers: list
+        :param keep_cs_active: keep CS pin active after sending messages
         :type keep_cs_active: bool
-        :return: list of bytes received
+        :return: list of length of data received into each buffer
         :rtype: list
         """
-        if self.dev.CS1_enabled:
-            # deactivate CS1 if activated
-            self.dev.set_CS1(False)
+        if not self.dev.CS2_enabled:
+            # activate CS2 if not (CS1 is deactivated in the same frame)
+            self.dev.set_CS(2)
+
+        ret = self.dev.spi_read_batch_into(buffers)
+
+        if not keep_cs_active:
+            self.dev.set_CS(2, False)
+
+        return ret
 
+    def writeRead_CS2(self, data: (list, bytes, bytearray, memoryview), keep_cs_active: bool = False) -> bytearray:
+        """
+        Write and read data through SPI bus with CS2 activated and return data received
+        :param data: data to write, bytes-like objects are sent without being copied
+        :type data: :obj:`list`, :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`
+        :param keep_cs_active: keep CS1 pin active after sending messages
+        :type keep_cs_active: bool
+        :return: data received
+        :rtype: bytearray
+        """
         if not self.dev.CS2_enabled:
-            # activate CS2 if not
-            self.dev.set_CS2(True)
+            # activate CS2 if not (CS1 is deactivated in the same frame)
+            self.dev.set_CS(2)
 
         ret = self.dev.spi_read_write(data)
 
         if not keep_cs_active:
-            self.dev.set_CS2(False)
+            self.dev.set_CS(2, False)
+
+        return ret
+
+    def writeRead_CS2_into(self, data: (list, bytes, bytearray, memoryview), out, keep_cs_active: bool = False) -> int:
+        """
+        Write and read data through SPI bus with CS2 activated, receiving data into a caller-owned buffer
+        :param data: data to write, bytes-like objects are sent without being copied
+        :type data: :obj:`list`, :obj:`bytes`, :obj:`bytearray`, :obj:`memoryview`
+        :param out: writable buffer to receive data (e.g. bytearray), no smaller than data
+        :type out: :obj:`bytearray`, :obj:`memoryview`
+        :param keep_cs_active: keep CS2 pin active after sending messages
+        :type keep_cs_active: bool
+        :return: length of data received
+        :rtype: int
+        """
+        if not self.dev.CS2_enabled:
+            # activate CS2 if not (CS1 is deactivated in the same frame)
+            self.dev.set_CS(2)
+
+        ret = self.dev.spi_read_write_into(data, out)
+
+        if not keep_cs_active:
+            self.dev.set_CS(2, False)
 
         return ret
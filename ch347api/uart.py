@@ -6,8 +6,10 @@
 # Created on: 2024/1/8
 
 from .__device import CH347HIDUART1
+from collections import deque
 import threading
-import time
+
+_RX_WAIT_MS = 50  # time for the receiver thread to wait for data before checking if it is still alive
 
 
 class UARTDevice:
@@ -35,10 +37,14 @@ class UARTDevice:
 
         self.__multithreading = multithreading
 
-        self.__received_data = []
+        self.__rx_chunks = deque()  # filled by the receiver thread, drained by read() without locking
+        self.__rx_buf = bytearray()  # data drained from the chunks, unread data starts at self.__rx_head
+        self.__rx_head = 0
+        self.__rx_waiting = False  # set while read() is waiting for the receiver thread
         self.__live = True
         self.__thread = threading.Thread(target=self.__receiver_thread)
-        self.__data_lock = threading.Lock()
+        self.__data_cv = threading.Condition()  # signals data arrival to a waiting read()
+        self.__read_lock = threading.Lock()  # serializes readers, never taken by the receiver thread
 
         if self.__multithreading:
             # enable multithreading receiver
@@ -50,20 +56,33 @@ class UARTDevice:
         :return:
         """
         while self.__live:
-            data = self.dev.read_raw()
+            # blocks in hidapi until data arrives or the wait expires, then drains what is queued
+            data = self.dev.read_raw(timeout_ms=_RX_WAIT_MS)
             if data:
-                self.__data_lock.acquire()
-                # print("received data:", bytes(data).hex())
-                self.__received_data.extend(data)
-                self.__data_lock.release()
-            else:
-                time.sleep(0.01)
+                # convert in the receiver thread so that readers only copy bytes
+                self.__rx_chunks.append(bytes(data))
+                if self.__rx_waiting:
+                    with self.__data_cv:
+                        self.__data_cv.notify()
+
+    def __drain(self) -> int:
+        """
+        Move the chunks queued by the receiver thread into the receive buffer
+        :return: number of unread bytes in the receive buffer
+        :rtype: int
+        """
+        chunks = self.__rx_chunks
+        while chunks:
+            self.__rx_buf.extend(chunks.popleft())
+        return len(self.__rx_buf) - self.__rx_head
 
     def __del__(self) -> None:
         if self.__multithreading:
             self.__live = False
+            with self.__data_cv:
+                # wake up a waiting reader, the receiver thread stops within _RX_WAIT_MS
+                self.__data_cv.notify_all()
             try:
-                self.__data_lock.release()
                 self.__thread.join()
             except RuntimeError:
                 pass
@@ -75,8 +94,10 @@ class UARTDevice:
         """
         if self.__multithreading:
             self.__live = False
+            with self.__data_cv:
+                # wake up a waiting reader, the receiver thread stops within _RX_WAIT_MS
+                self.__data_cv.notify_all()
             try:
-                self.__data_lock.release()
                 self.__thread.join()
             except RuntimeError:
                 pass
@@ -91,7 +112,7 @@ class UARTDevice:
         """
         return self.dev.write_raw(data)
 
-    def read(self, length: int = -1, timeout: int = 5) -> list:
+    def read(self, length: int = -1, timeout: int = 5) -> bytes:
         """
         Read data from the device if any byte is available
         :param length: maximum length of the data, default is -1 which means read all bytes that received
@@ -99,33 +120,34 @@ class UARTDevice:
         :param timeout: timeout in seconds, default is 5, set to 0 means return data from buffer immediately instead of
         waiting for the buffer to collect enough data (available only for multithreading)
         :type timeout: int
-        :return: list of bytes read
-        :rtype: list
+        :return: bytes read
+        :rtype: bytes
         """
         if self.__multithreading:
-            # wait for data
-            t0 = time.time()
-
-            if length < 0:
-                while time.time() - t0 < timeout and len(self.__received_data) == 0:
-                    time.sleep(0.002)
-            else:
-                while time.time() - t0 < timeout and length > len(self.__received_data):
-                    time.sleep(0.002)
-
-            self.__data_lock.acquire()
-
-            if len(self.__received_data) > length > 0:
-                ret = self.__received_data[:length]
-                self.__received_data = self.__received_data[length:]
-
-            else:
-                ret = self.__received_data
-                self.__received_data = []
-
-            self.__data_lock.release()
+            required = 1 if length < 0 else length
+            with self.__read_lock:
+                if self.__drain() < required and timeout > 0:
+                    # wait for data, the receiver thread only notifies while __rx_waiting is set
+                    with self.__data_cv:
+                        self.__rx_waiting = True
+                        self.__data_cv.wait_for(lambda: self.__drain() >= required, timeout=timeout)
+                        self.__rx_waiting = False
+
+                head = self.__rx_head
+                if len(self.__rx_buf) - head > length > 0:
+                    ret = bytes(self.__rx_buf[head:head + length])
+                    self.__rx_head = head + length
+                    if self.__rx_head > len(self.__rx_buf) >> 1:
+                        # compact once more than half of the buffer is read
+                        del self.__rx_buf[:self.__rx_head]
+                        self.__rx_head = 0
+
+                else:
+                    ret = bytes(self.__rx_buf[head:])
+                    self.__rx_buf.clear()
+                    self.__rx_head = 0
 
         else:
-            ret = self.dev.read_raw(length)
+            ret = bytes(self.dev.read_raw(length))
 
         return ret
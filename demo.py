@@ -6,26 +6,25 @@
 # Created on: 2024/1/7
 
 
-import random
+import asyncio
+import sys
 import time
 from ch347api import CH347HIDDev, I2CDevice, SPIDevice, UARTDevice, SPIClockFreq, I2CClockFreq
+from ch347api.aio import AsyncDevice
+
+SPI_TEST_PATTERN = b"\xa5\x5a\x5a\xa5" * 128  # 512 bytes looped back in the SPI write&read test
 
 
 def i2c_demo():
     print('[I2C] Scan start...')
     hiddev = CH347HIDDev()
     hiddev.init_I2C()
-    print('      ' + ''.join(map(lambda a : '{:02X} '.format(a), range(16))))
-    for i in range(128):
-        if i % 16 == 0:
-            print('0x{:02X}: '.format(i), end='')
-        exists = hiddev.i2c_exists(i)
-        if exists:
-            print('{:02X} '.format(i), end='')
-        else:
-            print('__ ', end='')
-        if i % 16 == 15:
-            print()
+    found = set(hiddev.i2c_scan_range(0, 128))
+    lines = ['      ' + ''.join('{:02X} '.format(a) for a in range(16))]
+    for row in range(0, 128, 16):
+        lines.append('0x{:02X}: '.format(row) + ''.join(
+            '{:02X} '.format(i) if i in found else '__ ' for i in range(row, row + 16)))
+    sys.stdout.write('\n'.join(lines) + '\n')
     
     print('[I2C] MPU6050 example')
     # initialize an i2c communication object (MPU6050 I2C address: 0x68)
@@ -50,17 +49,13 @@ def i2c_demo():
     print("[I2C] write to MPU6050 register 0x6B with data 0x80 to reset the device, status: {}".format(status))
     time.sleep(0.1)
 
-    # setting up MPU6050
-    status = i2c.write(0x6b, 0x01)
-    print("[I2C] write to MPU6050 register 0x6B with data 0x01, status: {}".format(status))
-    status = i2c.write(0x6c, 0x00)
-    print("[I2C] write to MPU6050 register 0x6C with data 0x00, status: {}".format(status))
-    status = i2c.write(0x19, 0x00)
-    print("[I2C] write to MPU6050 register 0x19 with data 0x00, status: {}".format(status))
-    status = i2c.write(0x1a, 0x02)
-    print("[I2C] write to MPU6050 register 0x1a with data 0x02, status: {}".format(status))
-    status = i2c.write(0x1c, 0x08)
-    print("[I2C] write to MPU6050 register 0x1c with data 0x08, status: {}".format(status))
+    # setting up MPU6050 (register writes are sent together, MPU6050 increments the register address after each
+    # byte so adjacent registers are written as one block, 0x1B keeps its reset value 0x00)
+    setup = [(0x6b, b"\x01\x00"), (0x19, b"\x00\x02\x00\x08")]
+    statuses = i2c.write_batch(setup)
+    for (reg, data), status in zip(setup, statuses):
+        print("[I2C] write to MPU6050 registers from 0x{:02X} with data 0x{}, status: {}".format(
+            reg, data.hex(), status))
 
 
 def spi_demo():
@@ -87,17 +82,19 @@ def spi_demo():
     spi.write_CS1(b"hello world", keep_cs_active=True)
     spi.write_CS1(b"this is ch347")
 
-    # read test (activate CS -> read data -> deactivate CS)
+    # read test (activate CS -> read data x 2048 -> deactivate CS)
     print("[SPI] performing SPI read test")
     read_length = 32768
-    for i in range(2048):
-        ret = bytes(spi.read_CS1(read_length))
+    # CS1 stays active across all reads instead of toggling around each one, every read is received into the same
+    # buffer and read commands are queued ahead so the bus is not idle while the host handles each result
+    buf = bytearray(read_length)
+    spi.read_CS1_batch_into([buf] * 2048)
+    ret = bytes(buf)
     print(f"[SPI] received {read_length} bytes from SPI bus on CS1: {ret[:16]}...(total: {len(ret)} bytes)", )
 
     # write&read test (activate CS -> read data -> deactivate CS)
-    random_bytes = b"\xa5\x5a\x5a\xa5" * 128
     print("[SPI] write read test result (with MOSI, MISO short connected): {}".format(
-        bytes(spi.writeRead_CS1(random_bytes)) == random_bytes
+        bytes(spi.writeRead_CS1(SPI_TEST_PATTERN)) == SPI_TEST_PATTERN
     ))
 
 
@@ -128,18 +125,34 @@ def uart_demo():
 
     # uart accuracy test
     print("[UART] continuous sending and receiving test with 4MB size in progress..")
-    payload = test_b3 * 64 * 1024 * 4
-    t0 = time.time()
+    payload = test_b3 * (64 * 1024 * 4)  # built before timing starts
+    t0 = time.perf_counter_ns()
     uart.write(payload)
     read = uart.read(len(payload), timeout=15)
+    t1 = time.perf_counter_ns()
     print("[UART] 4MB payload received, time spent: {:.2f} ms, accuracy test result: {}".format(
-        (time.time() - t0) * 1000, bytes(read) == payload))
+        (t1 - t0) / 1e6, read == payload))
 
     # [VITAL] kill sub-thread(receiver thread) for safe exit
     uart.kill()
 
 
+async def shared_device_demo():
+    # SPI and I2C transfers on one device object awaited together, each call runs in a worker thread and the device
+    # lock keeps the commands serialized while the other side is waiting (a batch holds the lock until it finishes,
+    # keep it short as the other side times out after waiting 2 s)
+    dev = CH347HIDDev()
+    spi = AsyncDevice(SPIDevice(ch347_device=dev))
+    i2c = AsyncDevice(I2CDevice(addr=0x68, ch347_device=dev))
+
+    buf = bytearray(32768)
+    received, who_am_i = await asyncio.gather(spi.read_CS1_batch_into([buf] * 8), i2c.read(0x75, 1))
+    print("[ASYNC] received {} bytes from SPI bus on CS1 and 0x{} from MPU6050 register 0x75".format(
+        sum(received), who_am_i.hex()))
+
+
 if __name__ == "__main__":
     #i2c_demo()
     spi_demo()
     #uart_demo()
+    #asyncio.run(shared_device_demo())
@@ -7,6 +7,13 @@
 
 import setuptools
 
+try:
+    # compile the optional frame helpers if Cython is available, ch347api falls back to pure Python otherwise
+    from Cython.Build import cythonize
+    ext_modules = cythonize([setuptools.Extension("ch347api._fast", ["ch347api/_fast.pyx"])])
+except ImportError:
+    ext_modules = []
+
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
@@ -33,7 +40,11 @@ setuptools.setup(
     install_requires=[
         'hidapi'
     ],
+    extras_require={
+        'bulk': ['pyusb']
+    },
     packages=setuptools.find_packages(),
+    ext_modules=ext_modules,
     python_requires=">=3.7",
     entry_points={'console_scripts':
                       []
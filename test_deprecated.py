@@ -4,20 +4,15 @@
 # Project: CH347PythonLib
 # Filename: test
 # Created on: 2023/7/31
-import struct
 
-import random
+import os
 import time
-from hashlib import sha256
 from ch347api import CH347HIDDev, VENDOR_ID, PRODUCT_ID
 
 
 def generate_random_data(length=50):
     # generate test bytes for transmission
-    res = []
-    for i in range(length):
-        res.append(int(random.random() * 255))
-    return bytes(res)
+    return os.urandom(length)
 
 
 """
@@ -77,13 +72,14 @@ if __name__ == '__main__':
     test_dev.spi_read(2)
     test_dev.set_CS1(False)
 
-    # specialized speed test (for project)
-    t0 = time.time()
+    # specialized speed test (for project), every read is received into the same buffer
+    feed = bytearray(test_data_frame_length)
+    t0 = time.perf_counter_ns()
     test_dev.set_CS1()  # enable CS1 for transmission
     for ele in range(4 * 3 * 200_000 // test_data_frame_length + 1):
-        feed = test_dev.spi_read(test_data_frame_length)
+        test_dev.spi_read_into(feed)
     test_dev.set_CS1(False)
-    print("1 sec of gtem data trans time spent {:.2f} ms".format((time.time() - t0) * 1000))
+    print("1 sec of gtem data trans time spent {:.2f} ms".format((time.perf_counter_ns() - t0) / 1e6))
 
     # read & write test
     print("performing spi_read_write test...")